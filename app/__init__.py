@@ -39,6 +39,11 @@ def create_app(config_name='default'):
     mail.init_app(app)
     limiter.init_app(app)
     
+    from app.utils.email import init_email
+    from app.utils.sms import init_sms
+    init_email(app)
+    init_sms(app)
+    
     # Configure login manager
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
@@ -8,9 +8,10 @@ from app.models import User, Application, InterviewSlot, SlotBooking, Announceme
 from app.auth.utils import create_candidate
 from app.utils.validators import allowed_file
 from app.utils.audit import log_audit
-from app.utils.email import send_credentials_email, send_announcement_email
+from app.utils.email import get_email_config, send_announcement_email
 from datetime import datetime, timedelta
 from sqlalchemy import func
+from sqlalchemy.orm import contains_eager, joinedload, raiseload, selectinload
 import pandas as pd
 from io import BytesIO
 import logging
@@ -207,8 +208,11 @@ def candidates():
     status = request.args.get('status', 'all')
     search = request.args.get('search', '')
     
-    # Build query
-    query = User.query.filter_by(role='candidate')
+    # Build query - raiseload guards against lazy loads sneaking into the template
+    query = User.query.filter_by(role='candidate').options(
+        selectinload(User.application),
+        raiseload('*')
+    )
     
     if search:
         query = query.filter(
@@ -310,18 +314,24 @@ def upload_candidates():
         
         # Send credentials emails and SMS to all successfully created users
         if users_to_email:
-            from app.utils.email import send_credentials_email
+            from app.utils.email import send_credentials_emails_bulk
             from app.utils.sms import send_credentials_sms
-            email_success_count = 0
+            # Users are already committed; a send failure must not hide the
+            # results page, the only place their temporary passwords are shown
+            try:
+                email_success_count, _ = send_credentials_emails_bulk(
+                    (item['user'], item['temp_password']) for item in users_to_email
+                )
+            except Exception:
+                current_app.logger.exception(f"Bulk credentials email failed for {len(users_to_email)} users")
+                email_success_count = 0
             sms_success_count = 0
             for item in users_to_email:
                 try:
-                    if send_credentials_email(item['user'], item['temp_password']):
-                        email_success_count += 1
                     if send_credentials_sms(item['user'], item['temp_password']):
                         sms_success_count += 1
                 except Exception as e:
-                    current_app.logger.warning(f"Failed to send notification to {item['user'].email}: {str(e)}")
+                    current_app.logger.warning(f"Failed to send SMS to {item['user'].email}: {str(e)}")
             
             current_app.logger.info(f"Sent credentials: {email_success_count} emails, {sms_success_count} SMS")
         
@@ -355,7 +365,10 @@ def manage_slots():
     # Get date filter
     date_filter = request.args.get('date', '')
     
-    query = InterviewSlot.query
+    query = InterviewSlot.query.options(
+        selectinload(InterviewSlot.bookings).joinedload(SlotBooking.user),
+        raiseload('*')
+    )
     
     if date_filter:
         try:
@@ -611,7 +624,10 @@ def toggle_slot(slot_id):
 @admin_required
 def announcements():
     """Manage announcements"""
-    announcements = Announcement.query.order_by(Announcement.created_at.desc()).all()
+    announcements = Announcement.query.options(
+        joinedload(Announcement.creator),
+        raiseload('*')
+    ).order_by(Announcement.created_at.desc()).all()
     return render_template('admin/announcements.html', announcements=announcements)
 
 
@@ -636,15 +652,20 @@ def create_announcement():
     db.session.add(announcement)
     db.session.commit()
     
-    # Send email and SMS to all candidates
-    candidates = User.query.filter_by(role='candidate').all()
-    if candidates:
+    # Send email and SMS to all candidates, streaming plain (name, email, phone)
+    # rows instead of hydrating a User per candidate
+    candidate_query = User.query.filter_by(role='candidate')
+    if db.session.query(candidate_query.exists()).scalar():
+        candidates = candidate_query.with_entities(
+            User.name, User.email, User.phone
+        ).yield_per(get_email_config().batch_size)
+        
         # Send emails
         success_count, failed_count = send_announcement_email(candidates, title, content)
         
         # Send SMS
         from app.utils.sms import send_announcement_sms
-        sms_success = send_announcement_sms(candidates, title, content)
+        sms_success, _ = send_announcement_sms(candidates, title, content)
         
         if success_count > 0 or sms_success > 0:
             flash(f'Announcement sent: {success_count} emails, {sms_success} SMS', 'success')
@@ -818,6 +839,10 @@ def manage_bookings():
         InterviewSlot, SlotBooking.slot_id == InterviewSlot.id
     ).join(
         Application, User.id == Application.user_id, isouter=True
+    ).options(
+        contains_eager(SlotBooking.user).contains_eager(User.application),
+        contains_eager(SlotBooking.slot),
+        raiseload('*')
     )
     
     if date_filter:
@@ -1105,7 +1130,10 @@ def export_full_report():
 def view_slot_bookings(slot_id):
     """View all bookings for a specific slot"""
     slot = InterviewSlot.query.get_or_404(slot_id)
-    bookings = SlotBooking.query.filter_by(slot_id=slot_id).join(User).all()
+    bookings = SlotBooking.query.filter_by(slot_id=slot_id).join(User).options(
+        contains_eager(SlotBooking.user).selectinload(User.application),
+        raiseload('*')
+    ).all()
     
     return render_template('admin/slot_bookings.html', slot=slot, bookings=bookings)
 
@@ -1150,7 +1178,9 @@ def admin_cancel_booking(booking_id):
 @super_admin_required
 def manage_admins():
     """View and manage admin users (super admin only)"""
-    admins = User.query.filter_by(role='admin').order_by(User.created_at.desc()).all()
+    admins = User.query.filter_by(role='admin').options(
+        raiseload('*')
+    ).order_by(User.created_at.desc()).all()
     return render_template('admin/manage_admins.html', admins=admins)
 
 
@@ -1200,13 +1230,16 @@ def create_admin():
             
             # Send credentials via email and SMS if requested
             if send_email:
-                send_admin_credentials_email(new_admin, temp_password)
+                email_sent = send_admin_credentials_email(new_admin, temp_password)
                 
                 # Also send SMS
                 from app.utils.sms import send_admin_credentials_sms
                 send_admin_credentials_sms(new_admin, temp_password)
                 
-                flash(f'Admin "{name}" created. Credentials sent via email and SMS.', 'success')
+                if email_sent:
+                    flash(f'Admin "{name}" created. Credentials sent via email and SMS.', 'success')
+                else:
+                    flash(f'Admin "{name}" created, but the email could not be sent. Temporary password: {temp_password}', 'warning')
             else:
                 flash(f'Admin "{name}" created. Temporary password: {temp_password}', 'success')
             
@@ -134,9 +134,7 @@ def get_stats():
     stats = {
         'total_candidates': User.query.filter_by(role='candidate').count(),
         'total_slots': InterviewSlot.query.count(),
-        'available_slots': InterviewSlot.query.filter_by(is_open=True).filter(
-            InterviewSlot.current_bookings < InterviewSlot.capacity
-        ).count(),
+        'available_slots': InterviewSlot.query.filter_by(is_open=True, is_full=False).count(),
         'total_bookings': SlotBooking.query.count(),
         'pending_applications': Application.query.filter_by(status='pending').count(),
         'slot_selected': Application.query.filter_by(status='slot_selected').count()
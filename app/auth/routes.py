@@ -180,13 +180,18 @@ def reset_password(token):
     if current_user.is_authenticated:
         return redirect(url_for('main.index'))
     
+    from datetime import datetime
     from app.models import PasswordResetToken
     from app.utils.security import hash_password
     
-    # Find token
-    reset_token = PasswordResetToken.query.filter_by(token=token).first()
+    # Find an unused, unexpired token by its (uniquely indexed) hash
+    reset_token = PasswordResetToken.query.filter(
+        PasswordResetToken.token_hash == PasswordResetToken.hash_token(token),
+        PasswordResetToken.used == False,
+        PasswordResetToken.expires_at > datetime.utcnow()
+    ).first()
     
-    if not reset_token or not reset_token.is_valid:
+    if not reset_token:
         flash('Invalid or expired reset link. Please request a new one.', 'danger')
         return redirect(url_for('auth.forgot_password'))
     
@@ -140,7 +140,7 @@ def create_password_reset_token(user):
         user: User object
     
     Returns:
-        str: The reset token
+        str: The raw reset token (only its hash is stored)
     """
     from datetime import timedelta
     from app.models import PasswordResetToken
@@ -158,7 +158,7 @@ def create_password_reset_token(user):
     
     reset_token = PasswordResetToken(
         user_id=user.id,
-        token=token,
+        token_hash=PasswordResetToken.hash_token(token),
         expires_at=expires_at
     )
     
@@ -167,3 +167,24 @@ def create_password_reset_token(user):
     
     logger.info(f"Created password reset token for user {user.email}")
     return token
+
+
+def cleanup_reset_tokens(retention_days=7):
+    """Delete spent password reset tokens
+    
+    Args:
+        retention_days (int): Keep expired tokens this many days for auditing
+    
+    Returns:
+        int: Number of tokens deleted
+    """
+    from app.models import PasswordResetToken
+    
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = PasswordResetToken.query.filter(
+        db.or_(PasswordResetToken.used == True, PasswordResetToken.expires_at < cutoff)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    
+    logger.info(f"Deleted {deleted} spent password reset tokens")
+    return deleted
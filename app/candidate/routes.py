@@ -31,8 +31,8 @@ def dashboard():
     today = datetime.now().date()
     available_slots = InterviewSlot.query.filter(
         InterviewSlot.is_open == True,
-        InterviewSlot.date >= today,
-        InterviewSlot.current_bookings < InterviewSlot.capacity
+        InterviewSlot.is_full == False,
+        InterviewSlot.date >= today
     ).order_by(InterviewSlot.date, InterviewSlot.start_time).all()
     
     return render_template('candidate/dashboard.html',
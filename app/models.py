@@ -1,8 +1,33 @@
 """Database models for recruitment system"""
+import hashlib
 import os
 from datetime import datetime
 from app import db
 from flask_login import UserMixin
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+
+class utcnow(FunctionElement):
+    """Database-side current time as naive UTC
+    
+    The app compares timestamps with datetime.utcnow(), so defaults must be
+    UTC regardless of the server's or session's TimeZone setting.
+    """
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    # now() is session-local; convert to UTC and drop the offset
+    return "(now() AT TIME ZONE 'utc')"
 
 
 class User(UserMixin, db.Model):
@@ -21,14 +46,15 @@ class User(UserMixin, db.Model):
     failed_login_attempts = db.Column(db.Integer, default=0)
     locked_until = db.Column(db.DateTime, nullable=True)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # Who created this admin
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
     
     # Relationships - use lazy='select' (default) for on-demand loading
-    application = db.relationship('Application', backref='user', uselist=False, cascade='all, delete-orphan', lazy='select')
-    slot_booking = db.relationship('SlotBooking', backref='user', uselist=False, cascade='all, delete-orphan', lazy='select')
-    created_slots = db.relationship('InterviewSlot', foreign_keys='InterviewSlot.created_by', backref='creator', lazy='dynamic')
-    created_announcements = db.relationship('Announcement', foreign_keys='Announcement.created_by', backref='creator', lazy='dynamic')
-    audit_logs = db.relationship('AuditLog', backref='user', cascade='all, delete-orphan', lazy='dynamic')
+    application = db.relationship('Application', back_populates='user', uselist=False, cascade='all, delete-orphan', lazy='select')
+    slot_booking = db.relationship('SlotBooking', back_populates='user', uselist=False, cascade='all, delete-orphan', lazy='select')
+    created_slots = db.relationship('InterviewSlot', foreign_keys='InterviewSlot.created_by', back_populates='creator', lazy='dynamic')
+    created_announcements = db.relationship('Announcement', foreign_keys='Announcement.created_by', back_populates='creator', lazy='dynamic')
+    audit_logs = db.relationship('AuditLog', back_populates='user', cascade='all, delete-orphan', lazy='dynamic')
+    reset_tokens = db.relationship('PasswordResetToken', back_populates='user', cascade='all, delete-orphan')
     
     @property
     def check_is_super_admin(self):
@@ -63,8 +89,10 @@ class Application(db.Model):
         default='pending',
         index=True  # Index for status filtering
     )
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow())
+    
+    user = db.relationship('User', back_populates='application')
     
     def __repr__(self):
         return f'<Application {self.user.name} - {self.status}>'
@@ -83,15 +111,21 @@ class InterviewSlot(db.Model):
     is_open = db.Column(db.Boolean, default=True)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
     version = db.Column(db.Integer, default=0, nullable=False)  # Optimistic locking
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Maintained by the database so "available slots" is a partial index scanned in date order
+    is_full = db.Column(db.Boolean, db.Computed('current_bookings >= capacity', persisted=True))
+    created_at = db.Column(db.DateTime, server_default=utcnow())
     
-    # Relationships
-    bookings = db.relationship('SlotBooking', backref='slot', cascade='all, delete-orphan')
+    __table_args__ = (
+        db.Index(
+            'ix_slots_avail', 'date', 'start_time',
+            postgresql_where=db.text('is_open AND NOT is_full'),
+            sqlite_where=db.text('is_open AND NOT is_full')
+        ),
+    )
     
-    @property
-    def is_full(self):
-        """Check if slot is at capacity"""
-        return self.current_bookings >= self.capacity
+    # Relationships
+    bookings = db.relationship('SlotBooking', back_populates='slot', cascade='all, delete-orphan')
+    creator = db.relationship('User', foreign_keys=[created_by], back_populates='created_slots')
     
     @property
     def is_available(self):
@@ -114,13 +148,16 @@ class SlotBooking(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     slot_id = db.Column(db.Integer, db.ForeignKey('interview_slots.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True)
-    booked_at = db.Column(db.DateTime, default=datetime.utcnow)
+    booked_at = db.Column(db.DateTime, server_default=utcnow())
     confirmed = db.Column(db.Boolean, default=True)
     
     __table_args__ = (
         db.UniqueConstraint('user_id', name='one_slot_per_user'),
     )
     
+    user = db.relationship('User', back_populates='slot_booking')
+    slot = db.relationship('InterviewSlot', back_populates='bookings')
+    
     def __repr__(self):
         return f'<SlotBooking {self.user.name} -> Slot {self.slot_id}>'
 
@@ -134,8 +171,10 @@ class Announcement(db.Model):
     content = db.Column(db.Text, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow())
+    
+    creator = db.relationship('User', foreign_keys=[created_by], back_populates='created_announcements')
     
     def __repr__(self):
         return f'<Announcement {self.title}>'
@@ -148,7 +187,7 @@ class SystemConfig(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     key = db.Column(db.String(50), unique=True, nullable=False)
     value = db.Column(db.Text)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow())
     
     @staticmethod
     def get_value(key, default=None):
@@ -180,7 +219,9 @@ class AuditLog(db.Model):
     action = db.Column(db.String(100), nullable=False)
     details = db.Column(db.Text)
     ip_address = db.Column(db.String(45))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
+    
+    user = db.relationship('User', back_populates='audit_logs')
     
     def __repr__(self):
         return f'<AuditLog {self.action} by User {self.user_id}>'
@@ -192,12 +233,18 @@ class PasswordResetToken(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    token = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    # Only a 16-byte digest of the emailed token is stored; lookups probe this index
+    token_hash = db.Column(db.LargeBinary(16), unique=True, nullable=False, index=True)
     expires_at = db.Column(db.DateTime, nullable=False)
     used = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
     
-    user = db.relationship('User', backref=db.backref('reset_tokens', cascade='all, delete-orphan'))
+    user = db.relationship('User', back_populates='reset_tokens')
+    
+    @staticmethod
+    def hash_token(token):
+        """Hash a raw reset token into its stored lookup key"""
+        return hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
     
     @property
     def is_valid(self):
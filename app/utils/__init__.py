@@ -1,7 +1,7 @@
 """Utility modules initialization"""
 from app.utils.security import hash_password, check_password, generate_random_password, generate_token
 from app.utils.email import (
-    send_email, send_credentials_email, send_slot_confirmation_email,
+    send_email, send_email_batch, send_email_async, send_credentials_email, send_credentials_emails_bulk, send_slot_confirmation_email,
     send_admin_credentials_email, send_password_reset_email, send_announcement_email,
     send_selection_email, send_rejection_email
 )
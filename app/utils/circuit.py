@@ -0,0 +1,51 @@
+"""Circuit breaker for outbound provider calls (Brevo, Fast2SMS)"""
+from collections import deque
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Stop calling a failing provider for a while
+
+    After `threshold` failures within `window` seconds the circuit opens and
+    allow() returns False for `cooldown` seconds, so callers fail fast
+    instead of waiting out timeouts and retries on every send. A success
+    clears the failure history.
+    """
+    
+    def __init__(self, name, threshold=10, window=30.0, cooldown=60.0):
+        self.name = name
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = deque(maxlen=threshold)
+        self._open_until = 0.0
+    
+    def allow(self):
+        """Check whether a call may go through"""
+        with self._lock:
+            if not self._open_until:
+                return True
+            if time.monotonic() < self._open_until:
+                return False
+            # Cooldown over - close and give the provider another chance
+            self._open_until = 0.0
+            self._failures.clear()
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self._failures.clear()
+    
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self._failures.append(now)
+            if len(self._failures) == self.threshold and now - self._failures[0] <= self.window:
+                self._open_until = now + self.cooldown
+                self._failures.clear()
+                logger.warning(f"{self.name} circuit open for {self.cooldown:.0f}s after {self.threshold} failures")
@@ -10,88 +10,416 @@ Brevo Setup:
    - EMAIL_FROM_NAME=Your Club Name
    - EMAIL_REPLY_TO=reply-to@email.com
 """
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
+from itertools import islice
+from jinja2 import Template
+from markupsafe import escape
 import logging
 import re
 import requests
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from app.utils.circuit import CircuitBreaker
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # C extension not available - fall back to regex stripping
+    HTMLParser = None
+
+try:
+    import orjson
+except ImportError:  # fall back to requests' stdlib json encoding
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 # Brevo API endpoint
 BREVO_API_URL = "https://api.brevo.com/v3/smtp/email"
+EMAIL_TIMEOUT = 10  # seconds
+EMAIL_BATCH_SIZE = 50  # messageVersions per request (Brevo allows up to 1000)
+ERROR_BODY_LIMIT = 500  # characters of an error response kept in logs
+
+# A send isn't idempotent: after a read timeout or a 500/502/504 Brevo may
+# already have queued the message, so retrying could deliver it twice (to a
+# whole batch). Only retry what Brevo never processed - connection failures
+# and 429/503 - with capped exponential backoff honouring Retry-After.
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+RETRY_STATUSES = (429, 503)
+AUTH_STATUSES = (401, 403)  # bad/revoked API key or unauthorised sender: nothing can succeed
+_retry = Retry(
+    total=3,
+    read=0,
+    backoff_factor=0.5,
+    backoff_max=30,
+    status_forcelist=RETRY_STATUSES,
+    allowed_methods=['POST'],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(max_retries=_retry))
+BACKGROUND_WORKERS = 4
+
+# Fire-and-forget sends run here so the request thread never waits on Brevo.
+# Worker threads are joined at interpreter exit, so queued emails still go out
+# on a graceful shutdown.
+_background = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix='email')
+
+
+class _RateGate:
+    """Space calls from all threads at least 1/rate seconds apart"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+    
+    def wait(self, rate):
+        if not rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next_at)
+            self._next_at = at + 1.0 / rate
+        if at > now:
+            time.sleep(at - now)
+
+
+# Keeps parallel batch posts under Brevo's request rate (EMAIL_MAX_RPS)
+_rate_gate = _RateGate()
+
+# Once Brevo keeps failing, skip sends for a minute instead of stalling each one
+_breaker = CircuitBreaker('Brevo')
+
+
+_HIDDEN_STYLE_RE = re.compile(r'display\s*:\s*none', re.IGNORECASE)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Regex fallback patterns, compiled once rather than on every email
+_PREHEADER_DQ_RE = re.compile(r'<div[^>]*style="[^"]*display:\s*none[^"]*"[^>]*>.*?</div>', re.DOTALL | re.IGNORECASE)
+_PREHEADER_SQ_RE = re.compile(r"<div[^>]*style='[^']*display:\s*none[^']*'[^>]*>.*?</div>", re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_BR_RE = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_P_CLOSE_RE = re.compile(r'</p>', re.IGNORECASE)
+_ROW_CLOSE_RE = re.compile(r'</(?:tr|li)>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_BLANK_RUN_RE = re.compile(r'\n\s*\n')
+_SPACES_RE = re.compile(r' +')
+_LEADING_SPACE_RE = re.compile(r'\n ')
+_ENTITY_MAP = {'nbsp': ' ', 'amp': '&', 'lt': '<', 'gt': '>', 'quot': '"', '#34': '"', '#39': "'"}
+_ENTITY_RE = re.compile(r'&(nbsp|amp|lt|gt|quot|#34|#39);')
 
 
 def strip_html_to_text(html):
     """Convert HTML to plain text for email"""
+    if HTMLParser is None:
+        return _strip_html_to_text_regex(html)
+    
+    tree = HTMLParser(html)
+    for node in tree.css('style, script'):
+        node.decompose()
+    # Hidden preheader divs (display:none) must not leak into the text part
+    for node in tree.css('div[style]'):
+        if _HIDDEN_STYLE_RE.search(node.attributes.get('style') or ''):
+            node.decompose()
+    for node in tree.css('br, tr, li'):
+        node.insert_after('\n')
+    for node in tree.css('p'):
+        node.insert_after('\n\n')
+    
+    root = tree.body or tree.root
+    if root is None:
+        return ''
+    lines = (' '.join(line.split()) for line in root.text(separator='').split('\n'))
+    return _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def _strip_html_to_text_regex(html):
+    """Convert HTML to plain text with regexes (fallback when selectolax is unavailable)"""
     # Remove hidden preheader divs first (they have display:none and max-height:0)
     # Handle both single and double quotes in style attribute with separate patterns
-    text = re.sub(r'<div[^>]*style="[^"]*display:\s*none[^"]*"[^>]*>.*?</div>', '', html, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<div[^>]*style='[^']*display:\s*none[^']*'[^>]*>.*?</div>", '', text, flags=re.DOTALL | re.IGNORECASE)
-    
-    text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-    text = re.sub(r'</p>', '\n\n', text, flags=re.IGNORECASE)
-    text = re.sub(r'</tr>', '\n', text, flags=re.IGNORECASE)
-    text = re.sub(r'</li>', '\n', text, flags=re.IGNORECASE)
-    text = re.sub(r'<[^>]+>', '', text)
-    text = text.replace('&nbsp;', ' ').replace('&amp;', '&')
-    text = text.replace('&lt;', '<').replace('&gt;', '>')
-    text = text.replace('&quot;', '"').replace('&#39;', "'")
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n ', '\n', text)
+    text = _PREHEADER_DQ_RE.sub('', html)
+    text = _PREHEADER_SQ_RE.sub('', text)
+    
+    text = _STYLE_RE.sub('', text)
+    text = _SCRIPT_RE.sub('', text)
+    text = _BR_RE.sub('\n', text)
+    text = _P_CLOSE_RE.sub('\n\n', text)
+    text = _ROW_CLOSE_RE.sub('\n', text)
+    text = _TAG_RE.sub('', text)
+    text = _ENTITY_RE.sub(lambda m: _ENTITY_MAP[m.group(1)], text)
+    text = _BLANK_RUN_RE.sub('\n\n', text)
+    text = _SPACES_RE.sub(' ', text)
+    text = _LEADING_SPACE_RE.sub('\n', text)
     return text.strip()
 
 
+EmailConfig = namedtuple('EmailConfig', 'configured api_key from_email from_name reply_to club support base_url max_rps workers batch_size')
+
+
+def init_email(app):
+    """Resolve email settings once and cache them on the app
+    
+    Call again after changing any of the email-related config keys.
+    """
+    cfg = app.config
+    from_email = cfg.get('EMAIL_FROM', 'noreply@example.com')
+    
+    # One keep-alive connection per sending thread; requests' default pool of 10
+    # would discard (and later re-handshake) connections once EMAIL_WORKERS > 10
+    workers = int(cfg.get('EMAIL_WORKERS', 16))
+    pool_size = workers + BACKGROUND_WORKERS
+    _session.mount('https://', HTTPAdapter(max_retries=_retry, pool_maxsize=pool_size))
+    
+    app.extensions['email_config'] = EmailConfig(
+        configured=bool(cfg.get('BREVO_API_KEY') and cfg.get('EMAIL_FROM')),
+        api_key=cfg.get('BREVO_API_KEY'),
+        from_email=from_email,
+        from_name=cfg.get('EMAIL_FROM_NAME', cfg.get('CLUB_NAME', 'Tech Club')),
+        reply_to=cfg.get('EMAIL_REPLY_TO', from_email),
+        club=cfg.get('CLUB_NAME', 'code.scriet'),
+        support=cfg.get('SUPPORT_EMAIL', 'support@codescriet.com'),
+        base_url=cfg.get('BASE_URL', 'http://localhost:5000'),
+        max_rps=float(cfg.get('EMAIL_MAX_RPS', 10)),
+        workers=workers,
+        batch_size=int(cfg.get('EMAIL_BATCH_SIZE', EMAIL_BATCH_SIZE)),
+    )
+    return app.extensions['email_config']
+
+
+def get_email_config():
+    """Get the cached EmailConfig for the current app"""
+    app = current_app._get_current_object()
+    email_config = app.extensions.get('email_config')
+    if email_config is None:
+        email_config = init_email(app)
+    return email_config
+
+
 def is_email_configured():
     """Check if Brevo is properly configured"""
-    api_key = current_app.config.get('BREVO_API_KEY')
-    from_email = current_app.config.get('EMAIL_FROM')
-    return bool(api_key and from_email)
+    return get_email_config().configured
+
+
+class EmailTransientError(Exception):
+    """Brevo failed a send with a transient status (429/5xx), after any safe retries"""
+
+
+class EmailAuthError(Exception):
+    """Brevo refused the API key or sender (401/403), so no other send can succeed either"""
 
 
-def send_email(to_email, subject, html_content):
-    """Send email using Brevo API"""
-    if not is_email_configured():
+def _post_email(cfg, payload):
+    """POST one payload to Brevo
+    
+    Returns:
+        int: the response status - 2xx accepted, other 4xx a permanent rejection
+    
+    Raises:
+        EmailTransientError: on 429/5xx (429/503 only once the session's
+            retries are exhausted), or while the circuit breaker is open
+        EmailAuthError: on 401/403; also counted against the circuit breaker
+    """
+    headers = {
+        "accept": "application/json",
+        "content-type": "application/json",
+        "api-key": cfg.api_key
+    }
+    
+    # Batch payloads carry tens of KB of HTML, where orjson encodes several times faster
+    if orjson is not None:
+        body = {'data': orjson.dumps(payload)}
+    else:
+        body = {'json': payload}
+    
+    if not _breaker.allow():
+        raise EmailTransientError("Brevo circuit open, skipping send")
+    
+    _rate_gate.wait(cfg.max_rps)
+    try:
+        response = _session.post(BREVO_API_URL, headers=headers, timeout=EMAIL_TIMEOUT, **body)
+    except requests.RequestException:
+        _breaker.record_failure()
+        raise
+    
+    if response.status_code in TRANSIENT_STATUSES:
+        _breaker.record_failure()
+        raise EmailTransientError(f"Brevo returned {response.status_code}: {response.text[:ERROR_BODY_LIMIT]}")
+    if response.status_code in AUTH_STATUSES:
+        # A misconfigured key fails every send; let the breaker see it
+        _breaker.record_failure()
+        raise EmailAuthError(f"Brevo returned {response.status_code}: {response.text[:ERROR_BODY_LIMIT]}")
+    _breaker.record_success()
+    if 200 <= response.status_code < 300:
+        # The body (message ids) is only worth reading when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Brevo accepted with %s: %s", response.status_code, response.text)
+        return response.status_code
+    
+    logger.warning(f"Brevo returned {response.status_code}: {response.text[:ERROR_BODY_LIMIT]}")
+    return response.status_code
+
+
+def send_email(to_email, subject, html_content, text_content=None):
+    """Send email using Brevo API
+    
+    text_content is derived from html_content when not given.
+    
+    Returns:
+        bool: True only if Brevo accepted the email
+    """
+    cfg = get_email_config()
+    if not cfg.configured:
         logger.warning(f"Brevo not configured. Skipping email to {to_email}")
-        return True
+        return False
     
+    return _send_one(cfg, to_email, subject, html_content, text_content)
+
+
+def _send_one(cfg, to_email, subject, html_content, text_content=None):
+    """Send a single email with an already-resolved config (safe off the app context)"""
     try:
-        api_key = current_app.config['BREVO_API_KEY']
-        from_email = current_app.config.get('EMAIL_FROM', 'noreply@example.com')
-        from_name = current_app.config.get('EMAIL_FROM_NAME', current_app.config.get('CLUB_NAME', 'Tech Club'))
-        reply_to = current_app.config.get('EMAIL_REPLY_TO', from_email)
-        
-        text_content = strip_html_to_text(html_content)
-        
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-            "api-key": api_key
-        }
+        if not text_content:
+            text_content = strip_html_to_text(html_content)
         
         payload = {
-            "sender": {"name": from_name, "email": from_email},
+            "sender": {"name": cfg.from_name, "email": cfg.from_email},
             "to": [{"email": to_email}],
-            "replyTo": {"email": reply_to, "name": f"{from_name} Support"},
+            "replyTo": {"email": cfg.reply_to, "name": f"{cfg.from_name} Support"},
             "subject": subject,
             "htmlContent": html_content,
             "textContent": text_content
         }
         
-        response = requests.post(BREVO_API_URL, headers=headers, json=payload)
-        
-        if response.status_code in [200, 201]:
-            logger.info(f"Email sent to {to_email}")
-            return True
-        else:
-            logger.warning(f"Brevo returned {response.status_code}: {response.text}")
+        if 200 <= _post_email(cfg, payload) < 300:
+            logger.info("Email sent to %s", to_email)
             return True
+        return False
         
     except Exception as e:
         logger.warning(f"Email failed to {to_email}: {str(e)}")
-        return True
+        return False
+
+
+def _with_text(message):
+    """Pad a (to, subject, html) message with text_content=None"""
+    return message if len(message) == 4 else (*message, None)
+
+
+def _batch_payload(cfg, chunk):
+    """Build one Brevo request carrying a messageVersion per message tuple"""
+    # Top-level subject/content are required; every version overrides them
+    _, subject, html_content = chunk[0][:3]
+    return {
+        "sender": {"name": cfg.from_name, "email": cfg.from_email},
+        "replyTo": {"email": cfg.reply_to, "name": f"{cfg.from_name} Support"},
+        "subject": subject,
+        "htmlContent": html_content,
+        "messageVersions": [
+            {
+                "to": [{"email": to_email}],
+                "subject": subject,
+                "htmlContent": html_content,
+                "textContent": text_content or strip_html_to_text(html_content)
+            }
+            for to_email, subject, html_content, text_content in map(_with_text, chunk)
+        ]
+    }
+
+
+def send_email_batch(messages, batch_size=None):
+    """Send many emails with one Brevo request per batch_size messages
+    
+    messages may be any iterable (e.g. a generator); it is consumed one batch
+    at a time with at most EMAIL_WORKERS batches in flight, so only those
+    batches' rendered HTML is held in memory. Batches are posted in parallel.
+    Brevo accepts or rejects a request as a whole, so a batch it rejects
+    with a 400 (e.g. one malformed address) is re-sent one message at a time
+    to give each recipient its own result. Transient failures (429/5xx, open
+    circuit) fail the whole batch, and a 401/403 fails the whole run without
+    posting the remaining batches.
+    
+    Args:
+        messages: iterable of (to_email, subject, html_content[, text_content]) tuples
+        batch_size: messages per request (default EMAIL_BATCH_SIZE config)
+    
+    Returns:
+        list: bool per message, in input order
+    """
+    cfg = get_email_config()
+    messages = iter(messages)
+    if not cfg.configured:
+        skipped = sum(1 for _ in messages)
+        if skipped:
+            logger.warning(f"Brevo not configured. Skipping {skipped} emails")
+        return [False] * skipped
+    
+    batch_size = batch_size or cfg.batch_size
+    chunks = iter(lambda: list(islice(messages, batch_size)), [])
+    
+    aborted = threading.Event()
+    
+    def _send(chunk):
+        if aborted.is_set():
+            return [False] * len(chunk)
+        try:
+            status = _post_email(cfg, _batch_payload(cfg, chunk))
+        except EmailAuthError as e:
+            aborted.set()
+            logger.error(f"Brevo refused the API key or sender, abandoning the run: {str(e)}")
+            return [False] * len(chunk)
+        except Exception as e:
+            logger.warning(f"Email batch of {len(chunk)} failed: {str(e)}")
+            return [False] * len(chunk)
+        if status != 400 or len(chunk) == 1:
+            return [200 <= status < 300] * len(chunk)
+        # One bad recipient shouldn't fail everyone else in the batch
+        logger.warning(f"Brevo rejected a batch of {len(chunk)}, retrying individually")
+        return [_send_one(cfg, *_with_text(message)) for message in chunk]
+    
+    results = []
+    requests_made = 0
+    skipped = 0
+    with ThreadPoolExecutor(max_workers=cfg.workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            if aborted.is_set():
+                # Nothing more can succeed; count the rest as failed without posting it
+                skipped = len(chunk) + sum(1 for _ in messages)
+                break
+            in_flight.append(executor.submit(_send, chunk))
+            requests_made += 1
+            if len(in_flight) >= cfg.workers:
+                results.extend(in_flight.popleft().result())
+        while in_flight:
+            results.extend(in_flight.popleft().result())
+    results.extend([False] * skipped)
+    
+    if requests_made:
+        logger.info(f"Email batch: {sum(results)}/{len(results)} accepted in {requests_made} requests")
+    return results
+
+
+def send_email_async(to_email, subject, html_content, text_content=None):
+    """Queue an email on the background pool and return immediately
+    
+    Use for notifications whose outcome the request doesn't report back.
+    
+    Returns:
+        Future: resolves to send_email's result
+    """
+    app = current_app._get_current_object()
+    
+    def _send():
+        # Worker threads don't inherit the request's app context
+        with app.app_context():
+            return send_email(to_email, subject, html_content, text_content)
+    
+    return _background.submit(_send)
 
 
 # Premium warm color palette - charcoal + gold
@@ -114,12 +442,28 @@ COLORS = {
 # Preheader configuration
 PREHEADER_PADDING_LENGTH = 100  # Number of non-breaking spaces to add after preheader text
 
+# Placeholder spliced with each recipient's name in pre-rendered bulk emails.
+# Private-use code points survive HTML parsing (NUL would be dropped), so the
+# same marker works in both the HTML and the derived plain-text body.
+NAME_SENTINEL = '\ue000name\ue000'
+
+
+def _body_template(source):
+    """Compile an email body once at import; values are HTML-escaped on render"""
+    return Template(source, autoescape=True, keep_trailing_newline=True)
+
+
+def _text_template(source):
+    """Compile a hand-written plain-text body once at import (no escaping)"""
+    return Template(source.strip(), keep_trailing_newline=False)
+
 
 def _base_template(header_bg, header_title, header_sub, body, footer_note, preheader=None):
     """Generate base email template with warm premium styling"""
     c = COLORS
-    club = current_app.config.get('CLUB_NAME', 'code.scriet')
-    support = current_app.config.get('SUPPORT_EMAIL', 'support@codescriet.com')
+    cfg = get_email_config()
+    club = cfg.club
+    support = cfg.support
     
     # Generate preheader div if preheader text is provided
     preheader_html = ''
@@ -169,288 +513,413 @@ def _base_template(header_bg, header_title, header_sub, body, footer_note, prehe
 </html>'''
 
 
-def send_credentials_email(user, temp_password):
-    """Send login credentials"""
-    c = COLORS
-    club = current_app.config.get('CLUB_NAME', 'code.scriet')
-    base_url = current_app.config.get('BASE_URL', 'http://localhost:5000')
-    login_url = f"{base_url}/auth/login"
-    
-    subject = f"{user.name}, your login details for {club}"
-    
-    body = f'''
-<p style="color:{c['text']};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {user.name},</p>
+_CREDENTIALS_BODY = _body_template('''
+<p style="color:{{ c.text }};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {{ user.name }},</p>
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
 Your account is ready. Here are your login details:
 </p>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['card']};border-radius:6px;border-left:3px solid {c['gold']};margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.card }};border-radius:6px;border-left:3px solid {{ c.gold }};margin:0 0 24px 0;">
 <tr><td style="padding:20px;">
-<p style="margin:0 0 10px 0;color:{c['text_muted']};font-size:13px;">
-<strong style="color:{c['text']};">Portal:</strong><br>
-<a href="{login_url}" style="color:{c['gold']};">{login_url}</a>
+<p style="margin:0 0 10px 0;color:{{ c.text_muted }};font-size:13px;">
+<strong style="color:{{ c.text }};">Portal:</strong><br>
+<a href="{{ login_url }}" style="color:{{ c.gold }};">{{ login_url }}</a>
 </p>
-<p style="margin:0 0 10px 0;color:{c['text_muted']};font-size:13px;">
-<strong style="color:{c['text']};">Email:</strong><br>{user.email}
+<p style="margin:0 0 10px 0;color:{{ c.text_muted }};font-size:13px;">
+<strong style="color:{{ c.text }};">Email:</strong><br>{{ user.email }}
 </p>
-<p style="margin:0;color:{c['text_muted']};font-size:13px;">
-<strong style="color:{c['text']};">Password:</strong><br>
-<code style="background:{c['bg']};padding:4px 10px;border-radius:4px;font-family:monospace;color:{c['gold_light']};font-size:15px;">{temp_password}</code>
+<p style="margin:0;color:{{ c.text_muted }};font-size:13px;">
+<strong style="color:{{ c.text }};">Password:</strong><br>
+<code style="background:{{ c.bg }};padding:4px 10px;border-radius:4px;font-family:monospace;color:{{ c.gold_light }};font-size:15px;">{{ temp_password }}</code>
 </p>
 </td></tr>
 </table>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['warning_bg']};border-radius:4px;border:1px solid rgba(201,150,58,0.25);margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.warning_bg }};border-radius:4px;border:1px solid rgba(201,150,58,0.25);margin:0 0 24px 0;">
 <tr><td style="padding:12px 16px;">
-<p style="margin:0;color:{c['warning']};font-size:13px;">Please change your password after your first login.</p>
+<p style="margin:0;color:{{ c.warning }};font-size:13px;">Please change your password after your first login.</p>
 </td></tr>
 </table>
 
 <table width="100%" cellpadding="0" cellspacing="0">
 <tr><td align="center">
-<a href="{login_url}" style="display:inline-block;padding:12px 28px;background:{c['gold']};color:{c['bg']};text-decoration:none;border-radius:4px;font-weight:bold;font-size:14px;">Sign In</a>
+<a href="{{ login_url }}" style="display:inline-block;padding:12px 28px;background:{{ c.gold }};color:{{ c.bg }};text-decoration:none;border-radius:4px;font-weight:bold;font-size:14px;">Sign In</a>
 </td></tr>
 </table>
-'''
-    
-    html = _base_template(c['card'], "Your Account is Ready", "Recruitment Portal", body, f"You registered for {club} recruitment.", preheader=f"Your {club} account is ready. Login details inside.")
-    return send_email(user.email, subject, html)
+''')
 
 
-def send_admin_credentials_email(user, temp_password):
-    """Send admin login credentials"""
+_CREDENTIALS_TEXT = _text_template('''
+Hello {{ user.name }},
+
+Your account is ready. Here are your login details:
+
+Portal: {{ login_url }}
+Email: {{ user.email }}
+Password: {{ temp_password }}
+
+Please change your password after your first login.
+
+Questions? Reach us at {{ support }}
+You registered for {{ club }} recruitment.
+''')
+
+
+def _credentials_message(user, temp_password):
+    """Build the (to, subject, html, text) message carrying login credentials"""
     c = COLORS
-    club = current_app.config.get('CLUB_NAME', 'code.scriet')
-    base_url = current_app.config.get('BASE_URL', 'http://localhost:5000')
+    cfg = get_email_config()
+    club = cfg.club
+    base_url = cfg.base_url
     login_url = f"{base_url}/auth/login"
     
-    subject = f"{user.name}, admin access granted - {club}"
+    subject = f"{user.name}, your login details for {club}"
+    
+    body = _CREDENTIALS_BODY.render(c=c, user=user, login_url=login_url, temp_password=temp_password)
+    text = _CREDENTIALS_TEXT.render(user=user, login_url=login_url, temp_password=temp_password, club=club, support=cfg.support)
     
-    body = f'''
-<p style="color:{c['text']};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {user.name},</p>
+    html = _base_template(c['card'], "Your Account is Ready", "Recruitment Portal", body, f"You registered for {club} recruitment.", preheader=f"Your {club} account is ready. Login details inside.")
+    return user.email, subject, html, text
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
-You now have admin access to the {club} portal.
+
+def send_credentials_email(user, temp_password):
+    """Send login credentials"""
+    return send_email(*_credentials_message(user, temp_password))
+
+
+def send_credentials_emails_bulk(users_with_passwords):
+    """Send login credentials to many users in Brevo batches
+    
+    Args:
+        users_with_passwords: iterable of (user, temp_password) pairs
+    
+    Returns:
+        tuple: (success_count, failed_count)
+    """
+    results = send_email_batch(
+        _credentials_message(user, temp_password)
+        for user, temp_password in users_with_passwords
+    )
+    success = sum(1 for sent in results if sent)
+    return success, len(results) - success
+
+
+_ADMIN_CREDENTIALS_BODY = _body_template('''
+<p style="color:{{ c.text }};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {{ user.name }},</p>
+
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
+You now have admin access to the {{ club }} portal.
 </p>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['card']};border-radius:6px;border-left:3px solid {c['gold']};margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.card }};border-radius:6px;border-left:3px solid {{ c.gold }};margin:0 0 24px 0;">
 <tr><td style="padding:20px;">
-<p style="margin:0 0 10px 0;color:{c['text_muted']};font-size:13px;">
-<strong style="color:{c['text']};">Portal:</strong><br>
-<a href="{login_url}" style="color:{c['gold']};">{login_url}</a>
+<p style="margin:0 0 10px 0;color:{{ c.text_muted }};font-size:13px;">
+<strong style="color:{{ c.text }};">Portal:</strong><br>
+<a href="{{ login_url }}" style="color:{{ c.gold }};">{{ login_url }}</a>
 </p>
-<p style="margin:0 0 10px 0;color:{c['text_muted']};font-size:13px;">
-<strong style="color:{c['text']};">Email:</strong><br>{user.email}
+<p style="margin:0 0 10px 0;color:{{ c.text_muted }};font-size:13px;">
+<strong style="color:{{ c.text }};">Email:</strong><br>{{ user.email }}
 </p>
-<p style="margin:0;color:{c['text_muted']};font-size:13px;">
-<strong style="color:{c['text']};">Password:</strong><br>
-<code style="background:{c['bg']};padding:4px 10px;border-radius:4px;font-family:monospace;color:{c['gold_light']};font-size:15px;">{temp_password}</code>
+<p style="margin:0;color:{{ c.text_muted }};font-size:13px;">
+<strong style="color:{{ c.text }};">Password:</strong><br>
+<code style="background:{{ c.bg }};padding:4px 10px;border-radius:4px;font-family:monospace;color:{{ c.gold_light }};font-size:15px;">{{ temp_password }}</code>
 </p>
 </td></tr>
 </table>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['warning_bg']};border-radius:4px;border:1px solid rgba(201,150,58,0.25);margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.warning_bg }};border-radius:4px;border:1px solid rgba(201,150,58,0.25);margin:0 0 24px 0;">
 <tr><td style="padding:12px 16px;">
-<p style="margin:0;color:{c['warning']};font-size:13px;">Change your password on first login.</p>
+<p style="margin:0;color:{{ c.warning }};font-size:13px;">Change your password on first login.</p>
 </td></tr>
 </table>
 
 <table width="100%" cellpadding="0" cellspacing="0">
 <tr><td align="center">
-<a href="{login_url}" style="display:inline-block;padding:12px 28px;background:{c['gold']};color:{c['bg']};text-decoration:none;border-radius:4px;font-weight:bold;font-size:14px;">Access Admin Panel</a>
+<a href="{{ login_url }}" style="display:inline-block;padding:12px 28px;background:{{ c.gold }};color:{{ c.bg }};text-decoration:none;border-radius:4px;font-weight:bold;font-size:14px;">Access Admin Panel</a>
 </td></tr>
 </table>
-'''
-    
-    html = _base_template(c['card'], "Admin Access Granted", club, body, f"You were granted admin access to {club}.", preheader=f"Admin access granted for {club}.")
-    return send_email(user.email, subject, html)
+''')
 
 
-def send_slot_confirmation_email(user, slot):
-    """Send interview slot confirmation"""
+_ADMIN_CREDENTIALS_TEXT = _text_template('''
+Hello {{ user.name }},
+
+You now have admin access to the {{ club }} portal.
+
+Portal: {{ login_url }}
+Email: {{ user.email }}
+Password: {{ temp_password }}
+
+Change your password on first login.
+
+Questions? Reach us at {{ support }}
+You were granted admin access to {{ club }}.
+''')
+
+
+def send_admin_credentials_email(user, temp_password):
+    """Send admin login credentials"""
     c = COLORS
-    club = current_app.config.get('CLUB_NAME', 'code.scriet')
+    cfg = get_email_config()
+    club = cfg.club
+    base_url = cfg.base_url
+    login_url = f"{base_url}/auth/login"
     
-    from datetime import datetime
-    slot_date = slot.date.strftime('%A, %B %d')
-    time_range = f"{slot.start_time.strftime('%I:%M %p')} – {slot.end_time.strftime('%I:%M %p')}"
+    subject = f"{user.name}, admin access granted - {club}"
     
-    subject = f"{user.name}, interview confirmed for {slot.date.strftime('%b %d')}"
+    body = _ADMIN_CREDENTIALS_BODY.render(c=c, user=user, login_url=login_url, temp_password=temp_password, club=club)
+    text = _ADMIN_CREDENTIALS_TEXT.render(user=user, login_url=login_url, temp_password=temp_password, club=club, support=cfg.support)
     
-    body = f'''
-<p style="color:{c['text']};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {user.name},</p>
+    html = _base_template(c['card'], "Admin Access Granted", club, body, f"You were granted admin access to {club}.", preheader=f"Admin access granted for {club}.")
+    return send_email(user.email, subject, html, text)
+
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
+_SLOT_CONFIRMATION_BODY = _body_template('''
+<p style="color:{{ c.text }};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {{ user.name }},</p>
+
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
 Your interview slot is confirmed. Details below:
 </p>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['card']};border-radius:6px;border-left:3px solid {c['success']};margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.card }};border-radius:6px;border-left:3px solid {{ c.success }};margin:0 0 24px 0;">
 <tr><td style="padding:20px;">
-<p style="margin:0 0 10px 0;color:{c['text_muted']};font-size:13px;">
-<strong style="color:{c['text']};">Date:</strong><br>
-<span style="color:{c['text']};font-size:15px;">{slot_date}</span>
+<p style="margin:0 0 10px 0;color:{{ c.text_muted }};font-size:13px;">
+<strong style="color:{{ c.text }};">Date:</strong><br>
+<span style="color:{{ c.text }};font-size:15px;">{{ slot_date }}</span>
 </p>
-<p style="margin:0;color:{c['text_muted']};font-size:13px;">
-<strong style="color:{c['text']};">Time:</strong><br>
-<span style="color:{c['text']};">{time_range}</span>
+<p style="margin:0;color:{{ c.text_muted }};font-size:13px;">
+<strong style="color:{{ c.text }};">Time:</strong><br>
+<span style="color:{{ c.text }};">{{ time_range }}</span>
 </p>
 </td></tr>
 </table>
 
-<p style="color:{c['text_muted']};font-size:13px;margin:0;line-height:1.5;">
+<p style="color:{{ c.text_muted }};font-size:13px;margin:0;line-height:1.5;">
 Please arrive a few minutes early. We look forward to meeting you.
 </p>
-'''
-    
-    html = _base_template(f"linear-gradient(135deg, #2d4a3e 0%, {c['card']} 100%)", "Interview Confirmed", "Your slot is booked", body, f"You booked an interview with {club}.", preheader=f"Your interview slot is confirmed for {slot_date}.")
-    return send_email(user.email, subject, html)
+''')
 
 
-def send_password_reset_email(user, reset_token):
-    """Send password reset link"""
+_SLOT_CONFIRMATION_TEXT = _text_template('''
+Hello {{ user.name }},
+
+Your interview slot is confirmed.
+
+Date: {{ slot_date }}
+Time: {{ time_range }}
+
+Please arrive a few minutes early. We look forward to meeting you.
+
+Questions? Reach us at {{ support }}
+You booked an interview with {{ club }}.
+''')
+
+
+def send_slot_confirmation_email(user, slot):
+    """Send interview slot confirmation in the background"""
     c = COLORS
-    club = current_app.config.get('CLUB_NAME', 'code.scriet')
-    base_url = current_app.config.get('BASE_URL', 'http://localhost:5000')
-    reset_url = f"{base_url}/auth/reset-password/{reset_token}"
+    cfg = get_email_config()
+    club = cfg.club
     
-    subject = f"{user.name}, password reset for {club}"
+    slot_date = slot.date.strftime('%A, %B %d')
+    time_range = f"{slot.start_time.strftime('%I:%M %p')} – {slot.end_time.strftime('%I:%M %p')}"
+    
+    subject = f"{user.name}, interview confirmed for {slot.date.strftime('%b %d')}"
+    
+    body = _SLOT_CONFIRMATION_BODY.render(c=c, user=user, slot_date=slot_date, time_range=time_range)
+    text = _SLOT_CONFIRMATION_TEXT.render(user=user, slot_date=slot_date, time_range=time_range, club=club, support=cfg.support)
     
-    body = f'''
-<p style="color:{c['text']};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {user.name},</p>
+    html = _base_template(f"linear-gradient(135deg, #2d4a3e 0%, {c['card']} 100%)", "Interview Confirmed", "Your slot is booked", body, f"You booked an interview with {club}.", preheader=f"Your interview slot is confirmed for {slot_date}.")
+    return send_email_async(user.email, subject, html, text)
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
+
+_PASSWORD_RESET_BODY = _body_template('''
+<p style="color:{{ c.text }};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {{ user.name }},</p>
+
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
 We received a request to reset your password. Click below to set a new one:
 </p>
 
 <table width="100%" cellpadding="0" cellspacing="0" style="margin:0 0 24px 0;">
 <tr><td align="center">
-<a href="{reset_url}" style="display:inline-block;padding:12px 28px;background:{c['gold']};color:{c['bg']};text-decoration:none;border-radius:4px;font-weight:bold;font-size:14px;">Reset Password</a>
+<a href="{{ reset_url }}" style="display:inline-block;padding:12px 28px;background:{{ c.gold }};color:{{ c.bg }};text-decoration:none;border-radius:4px;font-weight:bold;font-size:14px;">Reset Password</a>
 </td></tr>
 </table>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['warning_bg']};border-radius:4px;border:1px solid rgba(201,150,58,0.25);margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.warning_bg }};border-radius:4px;border:1px solid rgba(201,150,58,0.25);margin:0 0 24px 0;">
 <tr><td style="padding:12px 16px;">
-<p style="margin:0;color:{c['warning']};font-size:13px;">This link expires in 1 hour.</p>
+<p style="margin:0;color:{{ c.warning }};font-size:13px;">This link expires in 1 hour.</p>
 </td></tr>
 </table>
 
-<p style="color:{c['text_muted']};font-size:12px;margin:0;line-height:1.5;">
+<p style="color:{{ c.text_muted }};font-size:12px;margin:0;line-height:1.5;">
 If you didn't request this, ignore this email. Your account is safe.
 </p>
-'''
-    
-    html = _base_template(c['card'], "Reset Your Password", club, body, f"You requested a password reset for {club}.", preheader=f"Reset your {club} password securely.")
-    return send_email(user.email, subject, html)
+''')
 
 
-def send_announcement_email(candidates, title, content):
-    """Send announcement to candidates"""
+_PASSWORD_RESET_TEXT = _text_template('''
+Hello {{ user.name }},
+
+We received a request to reset your password. Open this link to set a new one:
+
+{{ reset_url }}
+
+This link expires in 1 hour.
+
+If you didn't request this, ignore this email. Your account is safe.
+
+Questions? Reach us at {{ support }}
+You requested a password reset for {{ club }}.
+''')
+
+
+def send_password_reset_email(user, reset_token):
+    """Send password reset link in the background"""
     c = COLORS
-    club = current_app.config.get('CLUB_NAME', 'code.scriet')
+    cfg = get_email_config()
+    club = cfg.club
+    base_url = cfg.base_url
+    reset_url = f"{base_url}/auth/reset-password/{reset_token}"
+    
+    subject = f"{user.name}, password reset for {club}"
     
-    success = 0
-    failed = 0
+    body = _PASSWORD_RESET_BODY.render(c=c, user=user, reset_url=reset_url)
+    text = _PASSWORD_RESET_TEXT.render(user=user, reset_url=reset_url, club=club, support=cfg.support)
     
-    for candidate in candidates:
-        subject = f"{candidate.name}, update from {club}"
-        
-        body = f'''
-<p style="color:{c['text']};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {candidate.name},</p>
+    html = _base_template(c['card'], "Reset Your Password", club, body, f"You requested a password reset for {club}.", preheader=f"Reset your {club} password securely.")
+    return send_email_async(user.email, subject, html, text)
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['card']};border-radius:6px;border-left:3px solid {c['gold']};margin:0 0 20px 0;">
+
+_ANNOUNCEMENT_BODY = _body_template('''
+<p style="color:{{ c.text }};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {{ name }},</p>
+
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.card }};border-radius:6px;border-left:3px solid {{ c.gold }};margin:0 0 20px 0;">
 <tr><td style="padding:20px;">
-<div style="color:{c['text_secondary']};font-size:14px;line-height:1.7;">{content}</div>
+<div style="color:{{ c.text_secondary }};font-size:14px;line-height:1.7;">{{ content|safe }}</div>
 </td></tr>
 </table>
-'''
-        
-        html = _base_template(c['card'], title, f"{club} Update", body, f"You're receiving this as a {club} applicant.", preheader=f"Important: {title} — from {club}")
-        
-        if send_email(candidate.email, subject, html):
-            success += 1
-        else:
-            failed += 1
-    
-    return success, failed
+''')
 
 
-def send_selection_email(user):
-    """Send selection notification"""
+def send_announcement_email(candidates, title, content):
+    """Send announcement to candidates
+    
+    Recipients are grouped into Brevo batch requests (see send_email_batch)
+    instead of being posted one after another. candidates may be any
+    iterable, including a streaming (yield_per) query.
+    """
     c = COLORS
-    club = current_app.config.get('CLUB_NAME', 'code.scriet')
-    base_url = current_app.config.get('BASE_URL', 'http://localhost:5000')
+    cfg = get_email_config()
+    club = cfg.club
     
-    subject = f"Congratulations {user.name} — Welcome to {club}"
+    # Checked once per broadcast: skip rendering entirely when nothing can be sent
+    if not cfg.configured:
+        skipped = sum(1 for _ in candidates)
+        logger.warning(f"Brevo not configured. Skipping announcement to {skipped} candidates")
+        return 0, skipped
+    
+    # Everything but the recipient's name is identical, so render the shell once.
+    # content is admin-authored HTML and is inserted as-is.
+    body = _ANNOUNCEMENT_BODY.render(c=c, name=NAME_SENTINEL, content=content)
+    shell = _base_template(c['card'], title, f"{club} Update", body, f"You're receiving this as a {club} applicant.", preheader=f"Important: {title} — from {club}")
     
-    body = f'''
-<p style="color:{c['text']};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {user.name},</p>
+    # Split once around the name so each recipient is a join, not a search-and-replace
+    html_parts = shell.split(NAME_SENTINEL)
+    text_parts = strip_html_to_text(shell).split(NAME_SENTINEL)
+    
+    # Generator: each batch is rendered only when send_email_batch pulls it
+    messages = (
+        (
+            candidate.email,
+            f"{candidate.name}, update from {club}",
+            str(escape(candidate.name)).join(html_parts),
+            candidate.name.join(text_parts)
+        )
+        for candidate in candidates
+    )
+    
+    results = send_email_batch(messages)
+    success = sum(1 for sent in results if sent)
+    failed = len(results) - success
+    
+    return success, failed
+
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 20px 0;line-height:1.6;">
-We're pleased to inform you that you've been selected to join <strong style="color:{c['text']};">{club}</strong>.
+_SELECTION_BODY = _body_template('''
+<p style="color:{{ c.text }};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {{ user.name }},</p>
+
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 20px 0;line-height:1.6;">
+We're pleased to inform you that you've been selected to join <strong style="color:{{ c.text }};">{{ club }}</strong>.
 </p>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['success_bg']};border-radius:6px;border:1px solid rgba(74,157,110,0.25);margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.success_bg }};border-radius:6px;border:1px solid rgba(74,157,110,0.25);margin:0 0 24px 0;">
 <tr><td style="padding:20px;text-align:center;">
-<p style="color:{c['success']};font-size:18px;font-weight:bold;margin:0;">You're in.</p>
+<p style="color:{{ c.success }};font-size:18px;font-weight:bold;margin:0;">You're in.</p>
 </td></tr>
 </table>
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 16px 0;line-height:1.6;">
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 16px 0;line-height:1.6;">
 Here's what happens next:
 </p>
 
 <table width="100%" cellpadding="0" cellspacing="0" style="margin:0 0 24px 0;">
-<tr><td style="padding:12px 16px;background:{c['card']};border-radius:4px;">
-<p style="margin:0;color:{c['text']};font-size:14px;"><strong>WhatsApp</strong> — You'll be added to our team groups</p>
+<tr><td style="padding:12px 16px;background:{{ c.card }};border-radius:4px;">
+<p style="margin:0;color:{{ c.text }};font-size:14px;"><strong>WhatsApp</strong> — You'll be added to our team groups</p>
 </td></tr>
 <tr><td style="height:8px;"></td></tr>
-<tr><td style="padding:12px 16px;background:{c['card']};border-radius:4px;">
-<p style="margin:0;color:{c['text']};font-size:14px;"><strong>Website</strong> — Your profile goes live as a member</p>
+<tr><td style="padding:12px 16px;background:{{ c.card }};border-radius:4px;">
+<p style="margin:0;color:{{ c.text }};font-size:14px;"><strong>Website</strong> — Your profile goes live as a member</p>
 </td></tr>
 <tr><td style="height:8px;"></td></tr>
-<tr><td style="padding:12px 16px;background:{c['card']};border-radius:4px;">
-<p style="margin:0;color:{c['text']};font-size:14px;"><strong>Discord</strong> — Join via the website for discussions</p>
+<tr><td style="padding:12px 16px;background:{{ c.card }};border-radius:4px;">
+<p style="margin:0;color:{{ c.text }};font-size:14px;"><strong>Discord</strong> — Join via the website for discussions</p>
 </td></tr>
 </table>
 
 <table width="100%" cellpadding="0" cellspacing="0" style="margin:0 0 24px 0;">
 <tr><td align="center">
-<a href="{base_url}" style="display:inline-block;padding:12px 28px;background:{c['success']};color:#fff;text-decoration:none;border-radius:4px;font-weight:bold;font-size:14px;">Visit Website</a>
+<a href="{{ base_url }}" style="display:inline-block;padding:12px 28px;background:{{ c.success }};color:#fff;text-decoration:none;border-radius:4px;font-weight:bold;font-size:14px;">Visit Website</a>
 </td></tr>
 </table>
 
-<p style="color:{c['text_muted']};font-size:13px;margin:0;line-height:1.5;">
+<p style="color:{{ c.text_muted }};font-size:13px;margin:0;line-height:1.5;">
 Welcome aboard. We're excited to work with you.
 </p>
-'''
-    
-    html = _base_template(f"linear-gradient(135deg, #2d4a3e 0%, {c['card']} 100%)", "You've Been Selected", "Welcome to the team", body, f"You applied for {club} recruitment.", preheader=f"Congratulations! You've been selected to join {club}.")
-    return send_email(user.email, subject, html)
+''')
 
 
-def send_rejection_email(user):
-    """Send rejection notification"""
+def send_selection_email(user):
+    """Send selection notification"""
     c = COLORS
-    club = current_app.config.get('CLUB_NAME', 'code.scriet')
+    cfg = get_email_config()
+    club = cfg.club
+    base_url = cfg.base_url
     
-    subject = f"{user.name}, regarding your {club} application"
+    subject = f"Congratulations {user.name} — Welcome to {club}"
+    
+    body = _SELECTION_BODY.render(c=c, user=user, club=club, base_url=base_url)
     
-    body = f'''
-<p style="color:{c['text']};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {user.name},</p>
+    html = _base_template(f"linear-gradient(135deg, #2d4a3e 0%, {c['card']} 100%)", "You've Been Selected", "Welcome to the team", body, f"You applied for {club} recruitment.", preheader=f"Congratulations! You've been selected to join {club}.")
+    return send_email(user.email, subject, html)
+
+
+_REJECTION_BODY = _body_template('''
+<p style="color:{{ c.text }};font-size:15px;margin:0 0 16px 0;line-height:1.5;">Hello {{ user.name }},</p>
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 20px 0;line-height:1.6;">
-Thank you for taking the time to apply and interview with us. We appreciate your interest in {club}.
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 20px 0;line-height:1.6;">
+Thank you for taking the time to apply and interview with us. We appreciate your interest in {{ club }}.
 </p>
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 24px 0;line-height:1.6;">
 After careful consideration, we've decided not to move forward with your application at this time. This was a competitive process with many strong candidates.
 </p>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['card']};border-radius:6px;border-left:3px solid {c['warning']};margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.card }};border-radius:6px;border-left:3px solid {{ c.warning }};margin:0 0 24px 0;">
 <tr><td style="padding:20px;">
-<p style="color:{c['text']};font-size:14px;font-weight:bold;margin:0 0 12px 0;">A few suggestions:</p>
-<ul style="color:{c['text_secondary']};font-size:13px;line-height:1.8;margin:0;padding-left:18px;">
+<p style="color:{{ c.text }};font-size:14px;font-weight:bold;margin:0 0 12px 0;">A few suggestions:</p>
+<ul style="color:{{ c.text_secondary }};font-size:13px;line-height:1.8;margin:0;padding-left:18px;">
 <li>Strengthen your core fundamentals</li>
 <li>Build personal projects to demonstrate skills</li>
 <li>Stay active in coding challenges and communities</li>
@@ -458,21 +927,31 @@ After careful consideration, we've decided not to move forward with your applica
 </td></tr>
 </table>
 
-<table width="100%" cellpadding="0" cellspacing="0" style="background:{c['success_bg']};border-radius:4px;border:1px solid rgba(74,157,110,0.2);margin:0 0 24px 0;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:{{ c.success_bg }};border-radius:4px;border:1px solid rgba(74,157,110,0.2);margin:0 0 24px 0;">
 <tr><td style="padding:14px 16px;text-align:center;">
-<p style="margin:0;color:{c['success']};font-size:13px;">You're welcome to apply again in our next recruitment round.</p>
+<p style="margin:0;color:{{ c.success }};font-size:13px;">You're welcome to apply again in our next recruitment round.</p>
 </td></tr>
 </table>
 
-<p style="color:{c['text_secondary']};font-size:14px;margin:0 0 16px 0;line-height:1.6;">
+<p style="color:{{ c.text_secondary }};font-size:14px;margin:0 0 16px 0;line-height:1.6;">
 We wish you the best in your journey ahead.
 </p>
 
-<p style="color:{c['text']};font-size:14px;margin:0;">
+<p style="color:{{ c.text }};font-size:14px;margin:0;">
 Regards,<br>
-<span style="color:{c['gold']};">The {club} Team</span>
+<span style="color:{{ c.gold }};">The {{ club }} Team</span>
 </p>
-'''
+''')
+
+
+def send_rejection_email(user):
+    """Send rejection notification"""
+    c = COLORS
+    club = get_email_config().club
+    
+    subject = f"{user.name}, regarding your {club} application"
+    
+    body = _REJECTION_BODY.render(c=c, user=user, club=club)
     
     html = _base_template(c['card'], "Thank You for Applying", "Application Update", body, f"You applied for {club} recruitment.", preheader=f"An update regarding your {club} application.")
     return send_email(user.email, subject, html)
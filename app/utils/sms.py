@@ -11,28 +11,112 @@ Fast2SMS Setup:
 Works on localhost! No domain verification needed.
 Free tier: ~10 SMS for testing
 """
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import re
 import requests
 from flask import current_app
+from app.utils.circuit import CircuitBreaker
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 
+try:
+    import orjson
+except ImportError:  # fall back to requests' stdlib json encoding
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 FAST2SMS_API_URL = "https://www.fast2sms.com/dev/bulkV2"
+SMS_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+SMS_BATCH_SIZE = 50  # numbers per bulkV2 request
+ANNOUNCEMENT_CONTENT_LIMIT = 100  # keeps header + title + content near one 160-char SMS
+ERROR_BODY_LIMIT = 500  # characters of an error response kept in logs
+
+_NON_DIGIT_RE = re.compile(r'[^0-9]')
+
+# A bulkV2 send isn't idempotent: after a read timeout or a 500/502/504 the
+# SMS may already be queued, and a retry would send (and bill) it again for
+# every number in the batch. Only connection failures and 429s - which never
+# reached the gateway's send queue - are retried, with jittered backoff
+# honouring Retry-After so parallel batches don't retry in lockstep.
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+RETRY_STATUSES = (429,)
+_retry = Retry(
+    total=3,
+    read=0,
+    backoff_factor=0.3,
+    backoff_jitter=0.3,
+    backoff_max=10,
+    status_forcelist=RETRY_STATUSES,
+    allowed_methods=['POST'],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Shared across sends so announcement fan-out reuses one keep-alive connection
+# instead of paying DNS + TCP + TLS to fast2sms.com for every message
+_session = requests.Session()
+_session.headers['Content-Type'] = 'application/json'
+_session.mount('https://', HTTPAdapter(max_retries=_retry))
+
+# SMS is best-effort: during an outage, skip sends instead of making every
+# admin action wait out timeouts and retries
+_breaker = CircuitBreaker('Fast2SMS', threshold=5, cooldown=30.0)
+
+
+SmsConfig = namedtuple('SmsConfig', 'configured api_key route club base_url workers')
+
+
+def init_sms(app):
+    """Resolve SMS settings once and cache them on the app
+    
+    Call again after changing any of the SMS-related config keys.
+    """
+    cfg = app.config
+    
+    # Keep one connection per announcement worker alive between batches
+    workers = int(cfg.get('SMS_WORKERS', 4))
+    _session.mount('https://', HTTPAdapter(max_retries=_retry, pool_maxsize=workers))
+    
+    app.extensions['sms_config'] = SmsConfig(
+        configured=bool(cfg.get('FAST2SMS_API_KEY')),
+        api_key=cfg.get('FAST2SMS_API_KEY'),
+        route=cfg.get('FAST2SMS_ROUTE', 'q'),
+        club=cfg.get('CLUB_NAME', 'Tech Club'),
+        base_url=cfg.get('BASE_URL', 'http://localhost:5000'),
+        workers=workers,
+    )
+    return app.extensions['sms_config']
+
+
+def get_sms_config():
+    """Get the cached SmsConfig for the current app"""
+    app = current_app._get_current_object()
+    sms_config = app.extensions.get('sms_config')
+    if sms_config is None:
+        sms_config = init_sms(app)
+    return sms_config
 
 
 def is_sms_configured():
     """Check if Fast2SMS is properly configured"""
-    api_key = current_app.config.get('FAST2SMS_API_KEY')
-    return bool(api_key)
+    return get_sms_config().configured
 
 
+@lru_cache(maxsize=4096)
 def format_phone_number(phone):
-    """Format phone number for Fast2SMS (10 digits, no country code)"""
+    """Format phone number for Fast2SMS (10 digits, no country code)
+    
+    Cached: the same stored numbers are formatted again for every broadcast.
+    """
     if not phone:
         return None
     
     # Remove all non-digits
-    phone = ''.join(filter(str.isdigit, str(phone)))
+    phone = _NON_DIGIT_RE.sub('', str(phone))
     
     # Remove country code if present (91 for India)
     if len(phone) == 12 and phone.startswith('91'):
@@ -48,6 +132,65 @@ def format_phone_number(phone):
     return phone
 
 
+def _post_sms(cfg, numbers, message):
+    """POST one message to a list of formatted numbers in a single bulkV2 call
+    
+    Returns:
+        bool: True if Fast2SMS accepted the request
+    """
+    payload = {
+        'route': cfg.route,
+        'message': message,
+        'language': 'english',
+        'flash': 0,
+        'numbers': ','.join(numbers)
+    }
+    
+    # Content-Type is already set on the session, so pre-encoded bytes go as-is
+    if orjson is not None:
+        body = {'data': orjson.dumps(payload)}
+    else:
+        body = {'json': payload}
+    
+    if not _breaker.allow():
+        logger.warning(f"Fast2SMS circuit open, skipping {len(numbers)} number(s)")
+        return False
+    
+    try:
+        response = _session.post(FAST2SMS_API_URL, headers={'authorization': cfg.api_key},
+                                 timeout=SMS_TIMEOUT, **body)
+    except requests.Timeout:
+        _breaker.record_failure()
+        logger.warning(f"Fast2SMS timed out for {len(numbers)} number(s)")
+        return False
+    except requests.RequestException as e:
+        _breaker.record_failure()
+        logger.warning(f"Fast2SMS request failed for {len(numbers)} number(s): {str(e)}")
+        return False
+    
+    if response.status_code in TRANSIENT_STATUSES:
+        _breaker.record_failure()
+    else:
+        _breaker.record_success()
+    
+    if not response.ok:
+        # 429s arrive here only after retries are exhausted; 5xx are not retried
+        logger.warning(f"Fast2SMS HTTP {response.status_code}: {response.text[:ERROR_BODY_LIMIT]}")
+        return False
+    
+    try:
+        result = response.json()
+    except ValueError:
+        logger.warning(f"Fast2SMS returned malformed JSON: {response.text[:ERROR_BODY_LIMIT]}")
+        return False
+    
+    if result.get('return'):
+        logger.info(f"SMS sent to {len(numbers)} number(s): {result.get('request_id', 'N/A')}")
+        return True
+    logger.warning(f"Fast2SMS error: {result.get('message', 'Unknown error')}")
+    return False
+
+
 def send_sms(to_phone, message):
     """Send SMS using Fast2SMS API
     
@@ -58,7 +201,8 @@ def send_sms(to_phone, message):
     Returns:
         bool: True always (never blocks workflow)
     """
-    if not is_sms_configured():
+    cfg = get_sms_config()
+    if not cfg.configured:
         logger.warning(f"Fast2SMS not configured. Skipping SMS to {to_phone}")
         return True
     
@@ -68,35 +212,10 @@ def send_sms(to_phone, message):
         return True
     
     try:
-        api_key = current_app.config['FAST2SMS_API_KEY']
-        route = current_app.config.get('FAST2SMS_ROUTE', 'q')
-        
-        headers = {
-            'authorization': api_key,
-            'Content-Type': 'application/json'
-        }
-        
-        payload = {
-            'route': route,
-            'message': message,
-            'language': 'english',
-            'flash': 0,
-            'numbers': phone
-        }
-        
-        response = requests.post(FAST2SMS_API_URL, headers=headers, json=payload)
-        result = response.json()
-        
-        if result.get('return'):
-            logger.info(f"SMS sent to {phone}: {result.get('request_id', 'N/A')}")
-            return True
-        else:
-            logger.warning(f"Fast2SMS error: {result.get('message', 'Unknown error')}")
-            return True  # Don't block workflow
-        
+        _post_sms(cfg, [phone], message)
     except Exception as e:
         logger.warning(f"SMS failed to {to_phone}: {str(e)}")
-        return True  # Never block workflow
+    return True  # Never block workflow
 
 
 def send_credentials_sms(user, temp_password):
@@ -104,8 +223,9 @@ def send_credentials_sms(user, temp_password):
     if not user.phone:
         return True
     
-    club_name = current_app.config.get('CLUB_NAME', 'Tech Club')
-    base_url = current_app.config.get('BASE_URL', 'http://localhost:5000')
+    cfg = get_sms_config()
+    club_name = cfg.club
+    base_url = cfg.base_url
     
     # Keep message concise for SMS (160 char limit for single SMS)
     message = f"""Welcome to {club_name}!
@@ -124,8 +244,9 @@ def send_admin_credentials_sms(user, temp_password):
     if not user.phone:
         return True
     
-    club_name = current_app.config.get('CLUB_NAME', 'Tech Club')
-    base_url = current_app.config.get('BASE_URL', 'http://localhost:5000')
+    cfg = get_sms_config()
+    club_name = cfg.club
+    base_url = cfg.base_url
     
     message = f"""Admin Access Granted - {club_name}
 
@@ -143,7 +264,7 @@ def send_slot_confirmation_sms(user, slot):
     if not user.phone:
         return True
     
-    club_name = current_app.config.get('CLUB_NAME', 'Tech Club')
+    club_name = get_sms_config().club
     
     # Format date and time
     date_str = slot.date.strftime('%d %b %Y')
@@ -163,33 +284,67 @@ def send_announcement_sms(candidates, title, content):
     """Send announcement to multiple candidates via SMS
     
     Args:
-        candidates: List of User objects
+        candidates: Iterable of users or (name, email, phone) rows
         title: Announcement title
         content: Announcement content
     
     Returns:
-        tuple: (success_count, failed_count)
+        tuple: (success_count, failed_count), counted per distinct number
     """
-    club_name = current_app.config.get('CLUB_NAME', 'Tech Club')
-    success = 0
-    failed = 0
+    cfg = get_sms_config()
+    phones = (candidate.phone for candidate in candidates if candidate.phone)
+    
+    if not cfg.configured:
+        skipped = sum(1 for _ in phones)
+        logger.warning(f"Fast2SMS not configured. Skipping announcement to {skipped} numbers")
+        return 0, skipped
     
     # Truncate content for SMS (keep under 160 chars total)
-    max_content_len = 100
-    if len(content) > max_content_len:
-        content = content[:max_content_len-3] + "..."
+    if len(content) > ANNOUNCEMENT_CONTENT_LIMIT:
+        content = content[:ANNOUNCEMENT_CONTENT_LIMIT - 3] + "..."
     
-    for candidate in candidates:
-        if candidate.phone:
-            message = f"""{club_name} Update
+    # Everyone gets the same text, so send it to SMS_BATCH_SIZE numbers per request
+    message = f"""{cfg.club} Update
 
 {title}
 
 {content}"""
-            
-            if send_sms(candidate.phone, message):
-                success += 1
-            else:
-                failed += 1
+    
+    success = 0
+    failed = 0
+    # Keyed by number so a phone shared by several candidates is sent (and billed) once
+    numbers = {}
+    for phone in phones:
+        number = format_phone_number(phone)
+        if number:
+            numbers[number] = None
+        else:
+            failed += 1
+    numbers = list(numbers)
+    
+    def _send(chunk):
+        try:
+            sent = _post_sms(cfg, chunk, message)
+        except Exception as e:
+            logger.warning(f"SMS batch of {len(chunk)} failed: {str(e)}")
+            sent = False
+        return sent, len(chunk)
+    
+    # Batches go out in parallel, never more than cfg.workers in flight
+    results = []
+    with ThreadPoolExecutor(max_workers=cfg.workers) as executor:
+        in_flight = deque()
+        for start in range(0, len(numbers), SMS_BATCH_SIZE):
+            in_flight.append(executor.submit(_send, numbers[start:start + SMS_BATCH_SIZE]))
+            if len(in_flight) >= cfg.workers:
+                results.append(in_flight.popleft().result())
+        while in_flight:
+            results.append(in_flight.popleft().result())
+    
+    for sent, size in results:
+        if sent:
+            success += size
+        else:
+            failed += size
     
     return success, failed
@@ -20,12 +20,21 @@ class Config:
     
     # Connection pool settings for Neon serverless - optimized for free tier
     SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,     # Test connections before using
-        'pool_recycle': 300,       # Recycle connections after 5 minutes
+        'pool_pre_ping': True,     # Test connections before using (Neon suspends idle computes)
+        'pool_recycle': 280,       # Recycle before Neon's 5 minute idle cutoff
         'pool_size': 2,            # Reduced for free tier (less memory)
         'max_overflow': 3,         # Limited extra connections
         'pool_timeout': 30,        # Wait up to 30s for connection
+        'pool_use_lifo': True,     # Reuse the most recent (warm) connection; spares age out
     }
+    if database_url.startswith('postgresql://'):
+        # TCP keepalives stop NAT/proxies from silently dropping idle pooled connections
+        SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+            'keepalives': 1,
+            'keepalives_idle': 30,
+            'keepalives_interval': 10,
+            'keepalives_count': 5,
+        }
     
     # Session Configuration
     PERMANENT_SESSION_LIFETIME = timedelta(seconds=int(os.environ.get('SESSION_TIMEOUT', 3600)))
@@ -40,11 +49,15 @@ class Config:
     EMAIL_FROM = os.environ.get('EMAIL_FROM', 'noreply@codescriet.dev')
     EMAIL_FROM_NAME = os.environ.get('EMAIL_FROM_NAME', 'code.scriet')
     EMAIL_REPLY_TO = os.environ.get('EMAIL_REPLY_TO', 'support@codescriet.com')
+    EMAIL_WORKERS = int(os.environ.get('EMAIL_WORKERS', 16))  # Parallel sends for announcements
+    EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', 50))  # Recipients per Brevo request
+    EMAIL_MAX_RPS = float(os.environ.get('EMAIL_MAX_RPS', 10))  # Brevo requests per second (0 = unlimited)
     
     # Fast2SMS Configuration (Indian SMS Gateway)
     # Sign up: https://fast2sms.com (free test credits, works on localhost!)
     FAST2SMS_API_KEY = os.environ.get('FAST2SMS_API_KEY')
     FAST2SMS_ROUTE = os.environ.get('FAST2SMS_ROUTE', 'q')  # 'q' for Quick SMS (promotional)
+    SMS_WORKERS = int(os.environ.get('SMS_WORKERS', 4))  # Parallel Fast2SMS requests for announcements
     
     # Application Configuration
     CLUB_NAME = os.environ.get('CLUB_NAME', 'code.scriet')
@@ -0,0 +1,37 @@
+"""Store hashed password reset tokens
+
+Revision ID: 2dd8318d54be
+Revises: ce7e49246c33
+Create Date: 2026-10-15 10:12:04.381920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2dd8318d54be'
+down_revision = 'ce7e49246c33'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Outstanding plaintext tokens can't be hashed retroactively; they expire within an hour anyway
+    op.execute('DELETE FROM password_reset_tokens')
+
+    with op.batch_alter_table('password_reset_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_password_reset_tokens_token'))
+        batch_op.drop_column('token')
+        batch_op.add_column(sa.Column('token_hash', sa.LargeBinary(length=16), nullable=False))
+        batch_op.create_index(batch_op.f('ix_password_reset_tokens_token_hash'), ['token_hash'], unique=True)
+
+
+def downgrade():
+    op.execute('DELETE FROM password_reset_tokens')
+
+    with op.batch_alter_table('password_reset_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_password_reset_tokens_token_hash'))
+        batch_op.drop_column('token_hash')
+        batch_op.add_column(sa.Column('token', sa.String(length=100), nullable=False))
+        batch_op.create_index(batch_op.f('ix_password_reset_tokens_token'), ['token'], unique=True)
@@ -0,0 +1,64 @@
+"""Use server-side timestamp defaults
+
+Revision ID: 5a7e2f9c4b13
+Revises: 8f3b1c6d2e47
+Create Date: 2026-10-15 11:05:52.117384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7e2f9c4b13'
+down_revision = '8f3b1c6d2e47'
+branch_labels = None
+depends_on = None
+
+
+TIMESTAMP_COLUMNS = {
+    'users': ['created_at'],
+    'applications': ['created_at', 'updated_at'],
+    'interview_slots': ['created_at'],
+    'slot_bookings': ['booked_at'],
+    'announcements': ['created_at', 'updated_at'],
+    'system_config': ['updated_at'],
+    'audit_logs': ['created_at'],
+    'password_reset_tokens': ['created_at'],
+}
+
+
+def _set_server_defaults(server_default):
+    # SQLite batch mode rebuilds the table with INSERT ... SELECT, which can't
+    # copy a generated column, so interview_slots.is_full is dropped and re-added there
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    if sqlite:
+        op.drop_index('ix_slots_avail', table_name='interview_slots')
+        with op.batch_alter_table('interview_slots', schema=None) as batch_op:
+            batch_op.drop_column('is_full')
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, existing_type=sa.DateTime(), server_default=server_default)
+
+    if sqlite:
+        with op.batch_alter_table('interview_slots', schema=None, recreate='always') as batch_op:
+            batch_op.add_column(sa.Column('is_full', sa.Boolean(), sa.Computed('current_bookings >= capacity', persisted=True), nullable=True))
+        op.create_index(
+            'ix_slots_avail', 'interview_slots', ['date', 'start_time'],
+            sqlite_where=sa.text('is_open AND NOT is_full')
+        )
+
+
+def upgrade():
+    # Columns are naive and compared against datetime.utcnow(), so Postgres must
+    # store UTC rather than now()'s session-local time; SQLite's is already UTC
+    if op.get_bind().dialect.name == 'postgresql':
+        _set_server_defaults(sa.text("(now() AT TIME ZONE 'utc')"))
+    else:
+        _set_server_defaults(sa.func.now())
+
+
+def downgrade():
+    _set_server_defaults(None)
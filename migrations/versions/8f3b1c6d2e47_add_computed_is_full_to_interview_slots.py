@@ -0,0 +1,36 @@
+"""Add computed is_full column to interview_slots
+
+Revision ID: 8f3b1c6d2e47
+Revises: 2dd8318d54be
+Create Date: 2026-10-15 10:41:27.905113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3b1c6d2e47'
+down_revision = '2dd8318d54be'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite can't ALTER TABLE ADD a STORED generated column, so rebuild the table there
+    recreate = 'always' if op.get_bind().dialect.name == 'sqlite' else 'auto'
+    with op.batch_alter_table('interview_slots', schema=None, recreate=recreate) as batch_op:
+        batch_op.add_column(sa.Column('is_full', sa.Boolean(), sa.Computed('current_bookings >= capacity', persisted=True), nullable=True))
+
+    op.create_index(
+        'ix_slots_avail', 'interview_slots', ['date', 'start_time'],
+        postgresql_where=sa.text('is_open AND NOT is_full'),
+        sqlite_where=sa.text('is_open AND NOT is_full')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_slots_avail', table_name='interview_slots')
+
+    with op.batch_alter_table('interview_slots', schema=None) as batch_op:
+        batch_op.drop_column('is_full')
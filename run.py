@@ -59,6 +59,15 @@ def create_admin():
     print(f"Admin user '{name}' created successfully!")
 
 
+@app.cli.command()
+def cleanup_reset_tokens():
+    """Delete used and long-expired password reset tokens (run nightly)"""
+    from app.auth.utils import cleanup_reset_tokens as sweep
+    
+    deleted = sweep()
+    print(f"Deleted {deleted} password reset token(s)")
+
+
 @app.cli.command()
 def init_db():
     """Initialize the database"""
@@ -0,0 +1,101 @@
+"""
+Tests for admin list views
+"""
+from datetime import date, time
+import pytest
+from app import db
+from app.models import User, Application, InterviewSlot, SlotBooking, Announcement
+
+
+@pytest.fixture
+def admin_client(fresh_app, client):
+    """Test client logged in as a super admin, with one booked candidate"""
+    admin = User(name='Admin', email='admin@example.com', password_hash='x', role='admin', is_super_admin=True)
+    candidate = User(name='Asha', email='asha@example.com', phone='9876543210', password_hash='x')
+    db.session.add_all([admin, candidate])
+    db.session.flush()
+    
+    slot = InterviewSlot(date=date(2030, 1, 1), start_time=time(10, 0), end_time=time(10, 30),
+                         capacity=2, current_bookings=1, created_by=admin.id)
+    db.session.add_all([
+        slot,
+        Application(user_id=candidate.id, department='CSE', year='2', status='slot_selected'),
+        Announcement(title='Hello', content='World', created_by=admin.id),
+    ])
+    db.session.flush()
+    db.session.add(SlotBooking(slot_id=slot.id, user_id=candidate.id))
+    db.session.commit()
+    
+    with client.session_transaction() as session:
+        session['_user_id'] = str(admin.id)
+        session['_fresh'] = True
+    
+    client.slot_id = slot.id
+    # Drop cached instances so each view loads through its own query options
+    db.session.expunge_all()
+    return client
+
+
+@pytest.mark.parametrize('path', [
+    '/admin/candidates',
+    '/admin/slots',
+    '/admin/bookings',
+    '/admin/announcements',
+    '/admin/admins',
+])
+def test_admin_list_views_render_without_lazy_loads(admin_client, path):
+    """Test that list views eager-load everything they render (raiseload('*') would raise)"""
+    response = admin_client.get(path)
+    assert response.status_code == 200
+
+
+def test_slot_bookings_view_renders(admin_client):
+    """Test that the per-slot bookings page eager-loads candidates"""
+    response = admin_client.get(f'/admin/slots/{admin_client.slot_id}/bookings')
+    assert response.status_code == 200
+    assert b'asha@example.com' in response.data
+
+
+def test_create_announcement_streams_candidates(admin_client, monkeypatch):
+    """Test that announcements reach every candidate from the streamed query"""
+    from app.admin import routes as admin_routes
+    from app.utils import sms as sms_utils
+    
+    emailed = []
+    texted = []
+    
+    def fake_email(candidates, title, content):
+        emailed.extend(c.email for c in candidates)
+        return len(emailed), 0
+    
+    def fake_sms(candidates, title, content):
+        texted.extend(c.phone for c in candidates)
+        return len(texted), 0
+    
+    monkeypatch.setattr(admin_routes, 'send_announcement_email', fake_email)
+    monkeypatch.setattr(sms_utils, 'send_announcement_sms', fake_sms)
+    
+    response = admin_client.post('/admin/announcements/create', data={'title': 'News', 'content': 'Body'})
+    
+    assert response.status_code == 302
+    assert emailed == ['asha@example.com']
+    assert texted == ['9876543210']
+
+
+def test_upload_shows_passwords_when_email_send_fails(admin_client, monkeypatch):
+    """Test that a failing bulk email still renders the credentials page"""
+    import io
+    from app.utils import email as email_utils
+    
+    def broken_bulk(pairs):
+        raise RuntimeError('template exploded')
+    
+    monkeypatch.setattr(email_utils, 'send_credentials_emails_bulk', broken_bulk)
+    csv = b'Name,Email,Department,Year\nRavi,ravi@example.com,CSE,2\n'
+    
+    response = admin_client.post('/admin/upload', data={'excel_file': (io.BytesIO(csv), 'candidates.csv')},
+                                 content_type='multipart/form-data')
+    
+    assert response.status_code == 200
+    assert b'ravi@example.com' in response.data
+    assert User.query.filter_by(email='ravi@example.com').count() == 1
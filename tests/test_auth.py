@@ -0,0 +1,43 @@
+"""
+Tests for authentication utilities
+"""
+from app import db
+from app.models import User, PasswordResetToken
+from app.auth.utils import create_password_reset_token, cleanup_reset_tokens
+
+
+def test_password_reset_token_stored_as_hash(fresh_app):
+    """Test that only the hash of a reset token is persisted and it resolves by hash"""
+    with fresh_app.app_context():
+        user = User(name='Asha', email='asha@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        
+        token = create_password_reset_token(user)
+        
+        stored = PasswordResetToken.query.filter_by(user_id=user.id).one()
+        assert stored.token_hash == PasswordResetToken.hash_token(token)
+        assert len(stored.token_hash) == 16
+        
+        found = PasswordResetToken.query.filter_by(
+            token_hash=PasswordResetToken.hash_token(token)
+        ).first()
+        assert found is not None and found.is_valid
+        assert PasswordResetToken.query.filter_by(
+            token_hash=PasswordResetToken.hash_token(token + 'x')
+        ).first() is None
+
+
+def test_cleanup_reset_tokens_removes_spent_tokens(fresh_app):
+    """Test that the sweeper deletes used tokens but keeps live ones"""
+    with fresh_app.app_context():
+        user = User(name='Asha', email='asha@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        
+        create_password_reset_token(user)
+        live_token = create_password_reset_token(user)  # marks the first one used
+        
+        assert cleanup_reset_tokens() == 1
+        remaining = PasswordResetToken.query.one()
+        assert remaining.token_hash == PasswordResetToken.hash_token(live_token)
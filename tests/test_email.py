@@ -157,3 +157,377 @@ def test_strip_html_handles_nested_quotes():
     # Main content should be preserved
     assert "Visible" in result_double
     assert "Visible" in result_single
+
+
+def test_announcement_email_batches_recipients(fresh_app, monkeypatch):
+    """Test that announcements go out as Brevo batches and tally per batch"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    payloads = []
+    
+    def fake_post_email(cfg, payload):
+        payloads.append(payload)
+        recipients = [v['to'][0]['email'] for v in payload['messageVersions']]
+        return 422 if 'fail@example.com' in recipients else 201
+    
+    monkeypatch.setattr(email_utils, '_post_email', fake_post_email)
+    fresh_app.config.update(BREVO_API_KEY='test-key', EMAIL_BATCH_SIZE=2)
+    email_utils.init_email(fresh_app)
+    candidates = [
+        SimpleNamespace(name='Asha', email='asha@example.com'),
+        SimpleNamespace(name='Ravi', email='ravi@example.com'),
+        SimpleNamespace(name='Fail', email='fail@example.com'),
+    ]
+    
+    with fresh_app.app_context():
+        success, failed = email_utils.send_announcement_email(candidates, "Title", "Body")
+    
+    assert (success, failed) == (2, 1)
+    assert len(payloads) == 2
+    versions = [v for p in payloads for v in p['messageVersions']]
+    assert sorted(v['to'][0]['email'] for v in versions) == sorted(c.email for c in candidates)
+    asha = next(v for v in versions if v['to'][0]['email'] == 'asha@example.com')
+    assert 'Hello Asha,' in asha['htmlContent']
+    assert asha['textContent'] == email_utils.strip_html_to_text(asha['htmlContent'])
+    assert all(v['textContent'] and v['subject'].endswith('update from ' + fresh_app.config['CLUB_NAME']) for v in versions)
+
+
+def test_email_config_cached_on_app(fresh_app):
+    """Test that email settings are resolved once and rebuilt by init_email"""
+    from app.utils.email import init_email, get_email_config, is_email_configured
+    
+    with fresh_app.app_context():
+        cfg = get_email_config()
+        assert cfg is fresh_app.extensions['email_config']
+        assert cfg.club == fresh_app.config['CLUB_NAME']
+        assert cfg.workers == fresh_app.config['EMAIL_WORKERS']
+        assert cfg.batch_size == fresh_app.config['EMAIL_BATCH_SIZE']
+        assert not is_email_configured()
+        
+        fresh_app.config['BREVO_API_KEY'] = 'test-key'
+        assert not is_email_configured()  # cached until re-initialised
+        init_email(fresh_app)
+        assert is_email_configured()
+
+
+def test_strip_html_regex_fallback_matches_parser(monkeypatch):
+    """Test that the regex fallback strips the same content when selectolax is missing"""
+    from app.utils import email as email_utils
+    
+    html = '''
+    <style>p { color: red; }</style>
+    <div style="display:none;">Hidden preheader</div>
+    <p>Hello&nbsp;there</p><p>Line<br>break &amp; more</p>
+    <p>Escaped &amp;lt;tag&amp;gt; stays escaped &quot;once&#39;</p>
+    '''
+    parsed = email_utils.strip_html_to_text(html)
+    
+    monkeypatch.setattr(email_utils, 'HTMLParser', None)
+    assert email_utils.strip_html_to_text(html) == parsed
+    assert "Hidden preheader" not in parsed
+    assert "break & more" in parsed
+    assert "&lt;tag&gt;" in parsed
+
+
+@pytest.mark.parametrize('status, expected', [(201, True), (400, False), (503, False)])
+def test_send_email_reports_real_status(fresh_app, monkeypatch, status, expected):
+    """Test that send_email only returns True when Brevo accepts the email"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    response = SimpleNamespace(status_code=status, text='{}')
+    monkeypatch.setattr(email_utils._session, 'post', lambda *args, **kwargs: response)
+    fresh_app.config['BREVO_API_KEY'] = 'test-key'
+    email_utils.init_email(fresh_app)
+    
+    with fresh_app.app_context():
+        assert email_utils.send_email('a@example.com', 'Subject', '<p>Hi</p>') is expected
+
+
+def test_send_email_unconfigured_returns_false(fresh_app):
+    """Test that skipping an unconfigured send is not reported as success"""
+    from app.utils.email import send_email
+    
+    with fresh_app.app_context():
+        assert send_email('a@example.com', 'Subject', '<p>Hi</p>') is False
+
+
+def test_send_email_async_runs_in_background(fresh_app, monkeypatch):
+    """Test that queued sends run off the request thread with an app context"""
+    import threading
+    from flask import current_app
+    from app.utils import email as email_utils
+    
+    seen = {}
+    
+    def fake_send_email(to_email, subject, html_content, text_content=None):
+        seen['thread'] = threading.current_thread()
+        seen['app'] = current_app._get_current_object()
+        return True
+    
+    monkeypatch.setattr(email_utils, 'send_email', fake_send_email)
+    
+    with fresh_app.app_context():
+        future = email_utils.send_email_async('a@example.com', 'Subject', '<p>Hi</p>')
+    
+    assert future.result(timeout=5) is True
+    assert seen['thread'] is not threading.current_thread()
+    assert seen['app'] is fresh_app
+
+
+def test_email_bodies_escape_user_values(fresh_app, monkeypatch):
+    """Test that templated bodies escape names while announcement content stays HTML"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    sent = []
+    monkeypatch.setattr(email_utils, 'send_email', lambda to, subject, html, text=None: sent.append(html) or True)
+    monkeypatch.setattr(email_utils, 'send_email_batch', lambda messages: [sent.append(m[2]) or True for m in messages])
+    user = SimpleNamespace(name='Asha <b>', email='asha@example.com')
+    fresh_app.config['BREVO_API_KEY'] = 'test-key'
+    email_utils.init_email(fresh_app)
+    
+    with fresh_app.app_context():
+        email_utils.send_credentials_email(user, 'P@ss&1')
+        email_utils.send_admin_credentials_email(user, 'P@ss&1')
+        email_utils.send_announcement_email([user], 'Title', '<b>Bold news</b>')
+    
+    credentials, admin_credentials, announcement = sent
+    for html in (credentials, admin_credentials):
+        assert 'Hello Asha &lt;b&gt;,' in html
+        assert 'P@ss&amp;1' in html
+    assert 'Hello Asha &lt;b&gt;,' in announcement
+    assert '<b>Bold news</b>' in announcement
+
+
+def test_rate_gate_spaces_requests(monkeypatch):
+    """Test that the Brevo rate gate spaces calls 1/rate apart and can be disabled"""
+    from app.utils import email as email_utils
+    
+    clock = [100.0]
+    sleeps = []
+    monkeypatch.setattr(email_utils.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(email_utils.time, 'sleep', sleeps.append)
+    
+    gate = email_utils._RateGate()
+    for _ in range(3):
+        gate.wait(4)
+    gate.wait(0)
+    
+    assert sleeps == [0.25, 0.5]
+
+
+def test_email_session_pool_fits_workers(fresh_app):
+    """Test that the shared Brevo session keeps a connection per sending thread"""
+    from app.utils import email as email_utils
+    
+    fresh_app.config['EMAIL_WORKERS'] = 20
+    email_utils.init_email(fresh_app)
+    
+    adapter = email_utils._session.get_adapter(email_utils.BREVO_API_URL)
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == 20 + email_utils.BACKGROUND_WORKERS
+    assert adapter.max_retries is email_utils._retry
+
+
+def test_password_reset_text_part_includes_link(fresh_app, monkeypatch):
+    """Test that the hand-written text part carries the reset URL the HTML button hides"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    sent = {}
+    monkeypatch.setattr(email_utils, 'send_email_async', lambda to, subject, html, text: sent.update(text=text))
+    user = SimpleNamespace(name='Asha', email='asha@example.com')
+    
+    with fresh_app.app_context():
+        email_utils.send_password_reset_email(user, 'tok123')
+    
+    assert sent['text'].startswith('Hello Asha,')
+    assert '/auth/reset-password/tok123' in sent['text']
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_post_email_encodes_payload(fresh_app, monkeypatch, use_orjson):
+    """Test that payloads are sent as the same JSON with or without orjson"""
+    import json
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    if not use_orjson:
+        monkeypatch.setattr(email_utils, 'orjson', None)
+    
+    captured = {}
+    
+    def fake_post(url, headers, timeout, data=None, json=None):
+        captured['body'] = data if data is not None else json
+        return SimpleNamespace(status_code=201, text='{}')
+    
+    monkeypatch.setattr(email_utils._session, 'post', fake_post)
+    payload = {"subject": "Hi – there", "htmlContent": "<p>Ünïcode</p>"}
+    
+    with fresh_app.app_context():
+        assert email_utils._post_email(email_utils.get_email_config(), payload) == 201
+    
+    body = captured['body']
+    assert (json.loads(body) if use_orjson else body) == payload
+
+
+def test_announcement_email_unconfigured_skips_rendering(fresh_app, monkeypatch):
+    """Test that an unconfigured broadcast counts every recipient as failed without rendering"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    def fail(*args, **kwargs):
+        raise AssertionError('should not render or send')
+    
+    monkeypatch.setattr(email_utils, '_base_template', fail)
+    monkeypatch.setattr(email_utils, 'send_email_batch', fail)
+    candidates = (SimpleNamespace(name=f'C{i}', email=f'c{i}@example.com') for i in range(3))
+    
+    with fresh_app.app_context():
+        assert email_utils.send_announcement_email(candidates, 'Title', 'Body') == (0, 3)
+
+
+def test_credentials_emails_bulk_batches_users(fresh_app, monkeypatch):
+    """Test that bulk credentials share batches and carry each user's own password"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    payloads = []
+    monkeypatch.setattr(email_utils, '_post_email', lambda cfg, payload: payloads.append(payload) or 201)
+    fresh_app.config.update(BREVO_API_KEY='test-key', EMAIL_BATCH_SIZE=50)
+    email_utils.init_email(fresh_app)
+    pairs = [(SimpleNamespace(name=f'User {i}', email=f'u{i}@example.com'), f'pw-{i}') for i in range(3)]
+    
+    with fresh_app.app_context():
+        assert email_utils.send_credentials_emails_bulk(pairs) == (3, 0)
+    
+    assert len(payloads) == 1
+    versions = payloads[0]['messageVersions']
+    assert [v['to'][0]['email'] for v in versions] == ['u0@example.com', 'u1@example.com', 'u2@example.com']
+    assert all(f'Password: pw-{i}' in v['textContent'] for i, v in enumerate(versions))
+
+
+def test_circuit_breaker_opens_and_recovers(monkeypatch):
+    """Test that repeated failures open the circuit until the cooldown passes"""
+    from app.utils import circuit
+    
+    clock = [0.0]
+    monkeypatch.setattr(circuit.time, 'monotonic', lambda: clock[0])
+    breaker = circuit.CircuitBreaker('Test', threshold=3, window=10, cooldown=60)
+    
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert not breaker.allow()
+    
+    clock[0] = 61.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.allow()  # history was reset when the circuit closed
+
+
+def test_post_email_fails_fast_while_circuit_open(fresh_app, monkeypatch):
+    """Test that an open Brevo circuit skips the HTTP call entirely"""
+    from app.utils import email as email_utils
+    from app.utils.circuit import CircuitBreaker
+    
+    breaker = CircuitBreaker('Brevo', threshold=1)
+    breaker.record_failure()
+    monkeypatch.setattr(email_utils, '_breaker', breaker)
+    monkeypatch.setattr(email_utils._session, 'post', lambda *args, **kwargs: pytest.fail('should not post'))
+    fresh_app.config['BREVO_API_KEY'] = 'test-key'
+    email_utils.init_email(fresh_app)
+    
+    with fresh_app.app_context():
+        with pytest.raises(email_utils.EmailTransientError):
+            email_utils._post_email(email_utils.get_email_config(), {})
+        assert email_utils.send_email('a@example.com', 'Subject', '<p>Hi</p>') is False
+
+
+def test_rejected_batch_is_resent_individually(fresh_app, monkeypatch):
+    """Test that a batch Brevo rejects outright falls back to per-recipient sends"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    posted = []
+    
+    def fake_post(cfg, payload):
+        if 'messageVersions' in payload:
+            posted.append('batch')
+            return 400  # one invalid address rejects the whole request
+        to_email = payload['to'][0]['email']
+        posted.append(to_email)
+        return 400 if to_email == 'bad@' else 201
+    
+    monkeypatch.setattr(email_utils, '_post_email', fake_post)
+    fresh_app.config.update(BREVO_API_KEY='test-key', EMAIL_BATCH_SIZE=50)
+    email_utils.init_email(fresh_app)
+    emails = ['u0@example.com', 'bad@', 'u2@example.com']
+    pairs = [(SimpleNamespace(name=f'User {i}', email=e), f'pw-{i}') for i, e in enumerate(emails)]
+    
+    with fresh_app.app_context():
+        assert email_utils.send_credentials_emails_bulk(pairs) == (2, 1)
+    
+    assert posted == ['batch'] + emails
+
+
+def test_selection_and_rejection_escape_user_values(fresh_app, monkeypatch):
+    """Test that decision emails render from templates with names escaped"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    
+    sent = []
+    monkeypatch.setattr(email_utils, 'send_email', lambda to, subject, html, text=None: sent.append(html) or True)
+    user = SimpleNamespace(name='Asha <b>', email='asha@example.com')
+    
+    with fresh_app.app_context():
+        assert email_utils.send_selection_email(user)
+        assert email_utils.send_rejection_email(user)
+    
+    for html in sent:
+        assert 'Hello Asha &lt;b&gt;,' in html
+
+
+def test_brevo_retry_skips_possibly_delivered_sends():
+    """Test that only sends Brevo never processed are retried (no duplicate deliveries)"""
+    import pytest
+    from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, ReadTimeoutError
+    from app.utils import email as email_utils
+    
+    retry = email_utils._retry
+    assert retry.is_retry('POST', 429)
+    assert retry.is_retry('POST', 503)
+    for status in (500, 502, 504):
+        assert not retry.is_retry('POST', status)
+    
+    # Connect failures never reached Brevo; read timeouts may have
+    assert retry.increment('POST', '/', error=ConnectTimeoutError()).total == 2
+    with pytest.raises(MaxRetryError):
+        retry.increment('POST', '/', error=ReadTimeoutError(None, '/', 'read timed out'))
+
+
+def test_auth_failure_abandons_batch_run(fresh_app, monkeypatch):
+    """Test that a 401 stops the run instead of falling back to per-recipient sends"""
+    from types import SimpleNamespace
+    from app.utils import email as email_utils
+    from app.utils.circuit import CircuitBreaker
+    
+    calls = []
+    
+    def fake_post(url, **kwargs):
+        calls.append(url)
+        return SimpleNamespace(status_code=401, text='{"code":"unauthorized"}')
+    
+    breaker = CircuitBreaker('Test', threshold=1)
+    monkeypatch.setattr(email_utils, '_breaker', breaker)
+    monkeypatch.setattr(email_utils._session, 'post', fake_post)
+    fresh_app.config.update(BREVO_API_KEY='revoked', EMAIL_WORKERS=1, EMAIL_MAX_RPS=0)
+    email_utils.init_email(fresh_app)
+    messages = [(f'u{i}@example.com', 'Hi', '<p>Hi</p>') for i in range(6)]
+    
+    with fresh_app.app_context():
+        assert email_utils.send_email_batch(messages, batch_size=2) == [False] * 6
+    
+    assert len(calls) == 1
+    assert not breaker.allow()
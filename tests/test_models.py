@@ -0,0 +1,44 @@
+"""
+Tests for database models
+"""
+from datetime import date, time
+from app import db
+from app.models import InterviewSlot, User
+
+
+def test_slot_is_full_computed_by_database(fresh_app):
+    """Test that is_full is maintained by the database and filterable"""
+    with fresh_app.app_context():
+        slot = InterviewSlot(date=date(2030, 1, 1), start_time=time(10, 0), end_time=time(10, 30), capacity=1)
+        db.session.add(slot)
+        db.session.commit()
+        
+        assert slot.is_full is False
+        assert slot.is_available
+        assert InterviewSlot.query.filter_by(is_open=True, is_full=False).count() == 1
+        
+        slot.current_bookings = 1
+        db.session.commit()
+        
+        assert slot.is_full is True
+        assert not slot.is_available
+        assert InterviewSlot.query.filter_by(is_open=True, is_full=False).count() == 0
+
+
+def test_timestamps_assigned_by_database(fresh_app):
+    """Test that created_at is filled in by the server-side default"""
+    with fresh_app.app_context():
+        user = User(name='Asha', email='asha@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        
+        assert user.created_at is not None
+
+
+def test_timestamp_defaults_are_utc_on_postgresql():
+    """Test that Postgres defaults store UTC, not the session's local time"""
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateTable
+    
+    ddl = str(CreateTable(User.__table__).compile(dialect=postgresql.dialect()))
+    assert "created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT (now() AT TIME ZONE 'utc')" in ddl
@@ -0,0 +1,183 @@
+"""
+Tests for SMS utilities
+"""
+import json
+
+import pytest
+
+
+def _json_body(kwargs):
+    """Decode the payload of a faked session.post call, orjson-encoded or not"""
+    if 'data' in kwargs:
+        return json.loads(kwargs['data'])
+    return kwargs['json']
+
+
+def test_sms_config_cached_on_app(fresh_app):
+    """Test that SMS settings are resolved once and rebuilt by init_sms"""
+    from app.utils.sms import init_sms, get_sms_config, is_sms_configured
+    
+    with fresh_app.app_context():
+        cfg = get_sms_config()
+        assert cfg is fresh_app.extensions['sms_config']
+        assert cfg.club == fresh_app.config['CLUB_NAME']
+        assert not is_sms_configured()
+        
+        fresh_app.config['FAST2SMS_API_KEY'] = 'test-key'
+        assert not is_sms_configured()  # cached until re-initialised
+        init_sms(fresh_app)
+        assert is_sms_configured()
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_send_sms_uses_shared_session(fresh_app, monkeypatch, use_orjson):
+    """Test that sends go through the pooled session with a timeout"""
+    from app.utils import sms
+    
+    if not use_orjson:
+        monkeypatch.setattr(sms, 'orjson', None)
+    
+    calls = []
+    
+    class FakeResponse:
+        ok = True
+        status_code = 200
+        
+        def json(self):
+            return {'return': True, 'request_id': 'r1'}
+    
+    def fake_post(url, **kwargs):
+        calls.append(kwargs)
+        return FakeResponse()
+    
+    monkeypatch.setattr(sms._session, 'post', fake_post)
+    fresh_app.config['FAST2SMS_API_KEY'] = 'test-key'
+    sms.init_sms(fresh_app)
+    
+    with fresh_app.app_context():
+        assert sms.send_sms('+91 98765 43210', 'hello')
+    
+    assert len(calls) == 1
+    assert calls[0]['timeout'] == sms.SMS_TIMEOUT
+    assert calls[0]['headers'] == {'authorization': 'test-key'}
+    assert _json_body(calls[0])['numbers'] == '9876543210'
+
+
+def test_announcement_sms_batches_numbers(fresh_app, monkeypatch):
+    """Test that announcement SMS go out SMS_BATCH_SIZE numbers per request"""
+    from collections import namedtuple
+    from app.utils import sms
+    
+    Row = namedtuple('Row', 'name email phone')
+    calls = []
+    
+    class FakeResponse:
+        ok = True
+        status_code = 200
+        
+        def json(self):
+            return {'return': True, 'request_id': 'r1'}
+    
+    def fake_post(url, **kwargs):
+        calls.append(_json_body(kwargs)['numbers'].split(','))
+        return FakeResponse()
+    
+    monkeypatch.setattr(sms._session, 'post', fake_post)
+    monkeypatch.setattr(sms, 'SMS_BATCH_SIZE', 2)
+    fresh_app.config['FAST2SMS_API_KEY'] = 'test-key'
+    sms.init_sms(fresh_app)
+    
+    candidates = [Row(f'C{i}', f'c{i}@test.com', f'98765432{i:02d}') for i in range(5)]
+    candidates += [Row('NoPhone', 'np@test.com', None), Row('Bad', 'bad@test.com', '123')]
+    candidates.append(Row('Sibling', 'sib@test.com', '+91 98765 43200'))  # shares C0's number
+    
+    with fresh_app.app_context():
+        success, failed = sms.send_announcement_sms(candidates, 'Title', 'Body')
+    
+    assert (success, failed) == (5, 1)
+    assert [len(chunk) for chunk in calls] == [2, 2, 1]
+    assert calls[0] == ['9876543200', '9876543201']
+
+
+def test_sms_pool_sized_to_workers(fresh_app):
+    """Test that init_sms sizes the keep-alive pool to SMS_WORKERS"""
+    from app.utils import sms
+    
+    fresh_app.config['SMS_WORKERS'] = 7
+    cfg = sms.init_sms(fresh_app)
+    
+    assert cfg.workers == 7
+    assert sms._session.get_adapter(sms.FAST2SMS_API_URL)._pool_maxsize == 7
+
+
+def test_post_sms_reports_transport_errors(fresh_app, monkeypatch):
+    """Test that timeouts and malformed replies count as failed, with retries mounted"""
+    import requests
+    from app.utils import sms
+    from app.utils.circuit import CircuitBreaker
+    
+    adapter = sms._session.get_adapter(sms.FAST2SMS_API_URL)
+    assert adapter.max_retries.total == 3
+    assert adapter.max_retries.read == 0  # a timed-out send may already be queued
+    assert adapter.max_retries.is_retry('POST', 429)
+    assert not adapter.max_retries.is_retry('POST', 500)
+    
+    monkeypatch.setattr(sms, '_breaker', CircuitBreaker('test'))
+    fresh_app.config['FAST2SMS_API_KEY'] = 'test-key'
+    cfg = sms.init_sms(fresh_app)
+    
+    def timeout_post(url, **kwargs):
+        raise requests.Timeout('read timed out')
+    
+    monkeypatch.setattr(sms._session, 'post', timeout_post)
+    assert sms._post_sms(cfg, ['9876543210'], 'hi') is False
+    
+    class HtmlResponse:
+        ok = True
+        status_code = 200
+        text = '<html>gateway</html>'
+        
+        def json(self):
+            raise ValueError('not json')
+    
+    monkeypatch.setattr(sms._session, 'post', lambda url, **kwargs: HtmlResponse())
+    assert sms._post_sms(cfg, ['9876543210'], 'hi') is False
+
+
+def test_sms_circuit_breaker_skips_sends(fresh_app, monkeypatch):
+    """Test that repeated Fast2SMS outages open the circuit and skip the HTTP call"""
+    import requests
+    from app.utils import sms
+    from app.utils.circuit import CircuitBreaker
+    
+    calls = []
+    
+    def down_post(url, **kwargs):
+        calls.append(url)
+        raise requests.ConnectionError('refused')
+    
+    monkeypatch.setattr(sms, '_breaker', CircuitBreaker('test', threshold=2))
+    monkeypatch.setattr(sms._session, 'post', down_post)
+    fresh_app.config['FAST2SMS_API_KEY'] = 'test-key'
+    cfg = sms.init_sms(fresh_app)
+    
+    for _ in range(4):
+        assert sms._post_sms(cfg, ['9876543210'], 'hi') is False
+    
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('raw,expected', [
+    ('9876543210', '9876543210'),
+    ('+91 98765-43210', '9876543210'),
+    ('09876543210', '9876543210'),
+    ('(987) 654 3210', '9876543210'),
+    ('12345', None),
+    ('', None),
+    (None, None),
+])
+def test_format_phone_number(raw, expected):
+    """Test phone normalisation for Fast2SMS"""
+    from app.utils.sms import format_phone_number
+    
+    assert format_phone_number(raw) == expected